@@ -32,6 +32,15 @@ def load_secrets(file_path):
 
 SENSOR_TYPE_CONFIG_PATH = "/config/init/sensor_types.yaml"
 
+# -----------------------------------------------------------------------------
+#       Data import
+# -----------------------------------------------------------------------------
+# Where `city_district_name` is computed: "python" (in the transform steps)
+# or "database" (single PostGIS UPDATE after the import).
+DISTRICT_ASSIGNMENT_MODE = os.getenv("DISTRICT_ASSIGNMENT_MODE") or "python"
+# Decided once here, both the transforms and the import step follow it
+ASSIGN_DISTRICTS_IN_DB = DISTRICT_ASSIGNMENT_MODE == "database"
+
 # -----------------------------------------------------------------------------
 #       Redis
 # -----------------------------------------------------------------------------
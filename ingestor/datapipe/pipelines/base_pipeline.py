@@ -19,6 +19,7 @@ from abc import ABC, abstractmethod
 from enum import Enum
 from datetime import datetime
 from ingestor.datapipe.utils.django_integration import get_django_model
+from ingestor.utils.geo_districts import CityDistrictsDecoder
 from django.utils import timezone
 
 
@@ -62,6 +63,9 @@ class BasePipeline(ABC):
     def run(self):
         PipelineRunStep = get_django_model("PipelineRunStep")
 
+        # District lookups are served from an index that is loaded once per run
+        CityDistrictsDecoder.reset_district_index()
+
         for resource in self.resources:
             context = PipelineContext(resource, self.out_dir, self.logger)
             self.logger.info("Processing data from: %s", context.out_dir)
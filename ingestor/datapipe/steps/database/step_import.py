@@ -17,6 +17,10 @@
 
 from ingestor.datapipe.steps.base_step import PipelineStep
 from ingestor.datapipe.utils.django_orm_utils import DjangoORMUtils
+from ingestor.utils.geo_districts import CityDistrictsDecoder
+from ingestor.config.env_config import ASSIGN_DISTRICTS_IN_DB
+from lautrer_wissen.changelog import bump_data_version
+from lautrer_wissen.post_import import refresh_derived_data
 import traceback
 import logging
 
@@ -60,12 +64,22 @@ class DatabaseImportStep(PipelineStep):
                 transform_func = add_model_type(db_model_class_type)
 
             logger.info("Importing data: %s", context.resource)
+            django_model = DjangoORMUtils.get_django_model_class(db_model_name)
             DjangoORMUtils.bulk_insert_and_cleanup(
-                django_model=DjangoORMUtils.get_django_model_class(db_model_name),
+                django_model=django_model,
                 db_model_rows=db_model_rows,
                 modify_model_fields_func=transform_func,
                 batch_size=5000,
+                # Rows of the transforms lack the district names in this mode
+                assign_districts_in_db=ASSIGN_DISTRICTS_IN_DB,
             )
+            bump_data_version(django_model)
+            if db_model_name == "KLCityDistrict":
+                # Subsequent lookups in this run must see the new districts
+                CityDistrictsDecoder.reset_district_index()
+
+            # Pre-render the TopoJSON and unfiltered GeoJSON served by /api/geo/<model>
+            refresh_derived_data(django_model)
             logger.info("Successfully imported data")
             return True
         except Exception as e:
@@ -38,11 +38,10 @@ class EmergencyPointTransformStep(DefaultTransformStep):
             del row["WGS_Breite"]
             del row["WGS_Laenge"]
 
-            row["city_district_name"] = CityDistrictsDecoder.get_district_name_for_geometry(row["geometry"])
             row["data_source"] = context.resource.data_source
             row["data_acquisition_date"] = creation_date
             result.append(row)
-        return result
+        return CityDistrictsDecoder.add_district_names(result)
 
     def _read_zip_as_df_with_creation_date(self, zip_file_path, src_filepath, region_filter):
         with zipfile.ZipFile(zip_file_path, 'r') as z:
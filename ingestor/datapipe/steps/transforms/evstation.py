@@ -87,11 +87,10 @@ class EvStationTransformStep(DefaultTransformStep):
                     except ValueError:
                         pass  
 
-            row["city_district_name"] = CityDistrictsDecoder.get_district_name_for_geometry(row["geometry"])
             row["data_source"] = context.resource.data_source
             row["data_acquisition_date"] = creation_date
             result.append(row)
-        return result
+        return CityDistrictsDecoder.add_district_names(result)
 
     def _extract_ladesaeulen_data(self, filepath: str):
         # Load all rows including header info
@@ -51,12 +51,11 @@ class ExternalGeoResourceTransformStep(DefaultTransformStep):
             for feature in features:
                 transformed_data = transform_func(feature)
                 if transformed_data:
-                    transformed_data["city_district_name"] = CityDistrictsDecoder.get_district_name_for_geometry(transformed_data["geometry"])
                     transformed_data["data_source"] = context.resource.data_source
                     transformed_data["data_acquisition_date"] = data_acquisition_date
                     result.append(transformed_data)
 
-        return result
+        return CityDistrictsDecoder.add_district_names(result)
 
     @staticmethod
     def _transform_parking_location(feature):
@@ -70,11 +70,10 @@ class MQTTSensorsTransformStep(DefaultTransformStep):
                 row = dict(sensor_topic=mqtt_res["topic"],
                            sensor_type=sensor_type,
                            geometry=position,
-                           city_district_name=CityDistrictsDecoder.get_district_name_for_geometry(position),
                            data_source=context.resource.data_source,
                            data_acquisition_date=data_acquisition_date)
                 result.append(row)
-        return result
+        return CityDistrictsDecoder.add_district_names(result)
 
     def _load_sensor_type_map(self):
         if os.path.exists(SENSOR_TYPE_CONFIG_PATH):
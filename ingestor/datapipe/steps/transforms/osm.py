@@ -71,8 +71,7 @@ class OSMTransformStep(DefaultTransformStep):
                 if field.name in row
             }
 
-            fields["city_district_name"] = CityDistrictsDecoder.get_district_name_for_geometry(fields["geometry"])
             fields["data_source"] = context.resource.data_source
             fields["data_acquisition_date"] = data_acquisition_date
             result.append(fields)
-        return result
\ No newline at end of file
+        return CityDistrictsDecoder.add_district_names(result)
\ No newline at end of file
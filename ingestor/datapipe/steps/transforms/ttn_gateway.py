@@ -55,9 +55,8 @@ class TTNGatewayTransformStep(DefaultTransformStep):
             
             row_mapped = TTNGatewayTransformStep.map_properties(row, TTNGatewayTransformStep.ATTR_MAPPING)
             row = {**row, **row_mapped}
-            row["city_district_name"] = CityDistrictsDecoder.get_district_name_for_geometry(row["geometry"])
             row["data_source"] = context.resource.data_source
             row["data_acquisition_date"] = data_acquisition_date
             result.append(row)
-        return result
+        return CityDistrictsDecoder.add_district_names(result)
 
@@ -54,14 +54,13 @@ class VRNBusStationTransformStep(DefaultTransformStep):
             row['geometry'] = Point(row['longitude'], row['latitude'])
             del row['latitude']
             del row['longitude']
-            row["city_district_name"] = CityDistrictsDecoder.get_district_name_for_geometry(row["geometry"])
             row["data_source"] = context.resource.data_source
             row["data_acquisition_date"] = creation_date
             row["seating"] = self.ATTR_MAPPING.get(row["seating"], row["seating"])
             row["waste_bin"] = self.ATTR_MAPPING.get(row["waste_bin"], row["waste_bin"])
             row["lighting"] = self.ATTR_MAPPING.get(row["lighting"], row["lighting"])
             result.append(row)
-        return result
+        return CityDistrictsDecoder.add_district_names(result)
 
     def _read_zip_as_df_with_creation_date(self, zip_file_path, src_filename):
         with zipfile.ZipFile(zip_file_path, 'r') as z:
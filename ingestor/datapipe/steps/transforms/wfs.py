@@ -101,11 +101,10 @@ class WFSTransformStep(DefaultTransformStep):
 
             geometry = WFSTransformStep._convert_geometry(feature['geometry'])    
             transformed_data["geometry"] = geometry
-            transformed_data["city_district_name"] = CityDistrictsDecoder.get_district_name_for_geometry(geometry)
             transformed_data["data_source"] = context.resource.data_source
             transformed_data["data_acquisition_date"] = data_acquisition_date
             result.append(transformed_data)
-        return result
+        return CityDistrictsDecoder.add_district_names(result)
 
     @staticmethod
     def map_properties(properties, mapping):
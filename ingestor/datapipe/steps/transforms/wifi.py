@@ -55,11 +55,10 @@ class WifiTransformStep(DefaultTransformStep):
                     for field in db_model._meta.fields
                     if field.name in row
                 }
-                fields["city_district_name"] = CityDistrictsDecoder.get_district_name_for_geometry(fields["geometry"])
                 fields["data_source"] = context.resource.data_source
                 fields["data_acquisition_date"] = data_acquisition_date
                 result.append(fields)
-            return result
+            return CityDistrictsDecoder.add_district_names(result)
 
     @staticmethod
     def _read_myspot_excell_as_df(context, db_model):
@@ -77,11 +76,10 @@ class WifiTransformStep(DefaultTransformStep):
                 for field in db_model._meta.fields
                 if field.name in row
             }
-            fields["city_district_name"] = CityDistrictsDecoder.get_district_name_for_geometry(fields["geometry"])
             fields["data_source"] = context.resource.data_source
             fields["data_acquisition_date"] = datetime.now().date() # check
             result.append(fields)
-        return result
+        return CityDistrictsDecoder.add_district_names(result)
 
     @staticmethod
     def _read_empera_kml_as_df(context, db_model):
@@ -98,8 +96,7 @@ class WifiTransformStep(DefaultTransformStep):
                 for field in db_model._meta.fields
                 if field.name in row
             }
-            fields["city_district_name"] = CityDistrictsDecoder.get_district_name_for_geometry(fields["geometry"])
             fields["data_source"] = context.resource.data_source
             fields["data_acquisition_date"] = datetime.strptime('15012025', '%d%m%Y').date() # check
             result.append(fields)
-        return result
+        return CityDistrictsDecoder.add_district_names(result)
@@ -51,6 +51,18 @@ def parse_int_or_default(value, default=-1):
     return default
 
 
+def assign_virtual_ids(rows):
+    """
+    Set the public id of wiki objects, the hash of their coordinates. Objects
+    sharing a location (e.g. Stolpersteine, shown on one detail page) share
+    the id, so it stays the same when objects are added or reordered.
+    """
+    for row in rows:
+        point = row["geometry"]
+        row["virtual_id"] = hashlib.md5(f"{point.y}:{point.x}".encode()).hexdigest()
+    return rows
+
+
 class WikiTransformStep(DefaultTransformStep):
 
     def transform(self, context, db_model, data_acquisition_date):
@@ -89,10 +101,12 @@ class WikiTransformStep(DefaultTransformStep):
                 del row[WikiDFColumns.IMAGE_FILENAME.value]
                 del row[WikiDFColumns.ADDITIONAL_IMAGE_URL_CATEGORY.value]
                 
-                row["virtual_id"] = hashlib.md5(f"{row["geometry"].y}:{row["geometry"].x}".encode()).hexdigest()
-                row["city_district_name"] = CityDistrictsDecoder.get_district_name_for_geometry(row["geometry"])
+                row.update(db_model.structured_list_fields(row))
+                row["display_name"] = db_model.display_name_for(row)
                 row["data_source"] = context.resource.data_source
                 row["data_acquisition_date"] = data_acquisition_date
 
                 result.append(row)
-        return result
+
+        assign_virtual_ids(result)
+        return CityDistrictsDecoder.add_district_names(result)
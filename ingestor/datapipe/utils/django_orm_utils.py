@@ -20,15 +20,20 @@ import logging
 
 from typing import List, Dict
 from shapely.wkt import dumps as shapely_to_wkt
-from django.db import transaction
+from django.db import connection, transaction
 from django.utils.timezone import now
 from django.contrib.gis.geos import GEOSGeometry
 from ingestor.datapipe.utils.django_integration import setup_django
+from ingestor.utils.geo_districts import DEFAULT_LOCAL_CRS, TARGET_CRS
+from ingestor.utils.geo_districts import UNKNOWN_DISTRICT_NAME, OUTSIDE_DISTRICT_NAME
 from typing import List, Dict, Callable
 
 logger = logging.getLogger("ingestor")
 setup_django()
 
+# Requires the Django apps to be set up
+from lautrer_wissen.changelog import assign_feature_keys, record_feature_changes
+
 
 class DjangoORMUtils:
 
@@ -48,6 +53,7 @@ class DjangoORMUtils:
         db_model_rows: List[Dict],
         modify_model_fields_func: Callable = None,
         batch_size: int = 5000,
+        assign_districts_in_db: bool = False,
     ):
         """
         Efficiently inserts records in bulk and removes outdated records using Django ORM.
@@ -55,7 +61,11 @@ class DjangoORMUtils:
         Steps:
         1. Assign a single insert timestamp for the operation.
         2. Bulk insert all new records with the same insert timestamp.
-        3. Delete outdated records (same data_source but older insert_timestamp).
+        3. Optionally assign `city_district_name` of the new records in PostGIS.
+        4. Compute simplified LOD geometries of the new records (if the model has any).
+        5. Assign stable feature keys to the new records.
+        6. Record inserted, updated and deleted features in the change log.
+        7. Delete outdated records (same data_source but older insert_timestamp).
         """
         if not db_model_rows:
             return
@@ -67,7 +77,7 @@ class DjangoORMUtils:
         model_fields = [
             field.name
             for field in django_model._meta.fields
-            if field.name not in ["id", "insert_timestamp"]
+            if field.name not in ["id", "insert_timestamp"] and not field.generated
         ]
 
         if modify_model_fields_func:
@@ -90,15 +100,27 @@ class DjangoORMUtils:
             for row in db_model_rows
         ]
 
-        # Bulk insert using Django ORM
-        for i in range(0, len(new_records), batch_size):
-            django_model.objects.bulk_create(
-                new_records[i : i + batch_size], batch_size=batch_size
-            )
-            logger.info("Inserted new records...")
-
-        # Delete outdated records
+        # New records become visible together with their districts, LOD
+        # geometries and keys, replacing the outdated ones at once
         with transaction.atomic():
+            # Bulk insert using Django ORM
+            for i in range(0, len(new_records), batch_size):
+                django_model.objects.bulk_create(
+                    new_records[i : i + batch_size], batch_size=batch_size
+                )
+                logger.info("Inserted new records...")
+
+            if assign_districts_in_db:
+                updated_count = DjangoORMUtils.assign_city_districts(django_model, insert_ts)
+                logger.info("Assigned city districts for %s records.", updated_count)
+
+            updated_count = DjangoORMUtils.update_lod_geometries(django_model, insert_ts)
+            if updated_count:
+                logger.info("Computed LOD geometries for %s records.", updated_count)
+
+            assign_feature_keys(django_model, insert_ts)
+
+            # Delete outdated records
             if django_model.__name__ == "GenericGeoModel":
                 
                 if len(new_records) > 0:
@@ -109,6 +131,7 @@ class DjangoORMUtils:
                     # Only keep rows of the same type as objects in the queryset
                     types_to_delete = [record.type for record in new_records]
                     queryset = queryset.filter(type__in=types_to_delete)
+                    DjangoORMUtils.log_feature_changes(django_model, queryset, insert_ts, data_source)
                     deleted_count, _ = queryset.delete()
                     logger.info("Deleted %s outdated GenericGeoModel records of matching types.", deleted_count)
             else:
@@ -118,6 +141,115 @@ class DjangoORMUtils:
                 )
                 queryset |= django_model.objects.filter(data_source__isnull=True)
                 queryset |= django_model.objects.filter(data_source="")
+                DjangoORMUtils.log_feature_changes(django_model, queryset, insert_ts, data_source)
                 deleted_count, _ = queryset.delete()
                 logger.info("Deleted %s outdated records.", deleted_count)
-        
\ No newline at end of file
+
+    @staticmethod
+    def log_feature_changes(django_model, outdated_queryset, insert_ts, data_source):
+        """
+        Records the features inserted, updated and deleted by this import,
+        served to clients via `?since=` (see lautrer_wissen.changelog).
+        """
+        run = record_feature_changes(django_model, outdated_queryset, insert_ts, data_source)
+        logger.info(
+            "Import run %s: %s inserted, %s updated, %s deleted features.",
+            run.pk, run.inserted_count, run.updated_count, run.deleted_count,
+        )
+
+    @staticmethod
+    def assign_city_districts(django_model, insert_ts):
+        """
+        Sets `city_district_name` for all records inserted at `insert_ts` with a
+        single spatial join in PostGIS. Features spanning several districts get
+        the sorted, comma separated district names (same result as
+        `CityDistrictsDecoder.get_district_name_for_geometry`).
+
+        Returns the number of updated records.
+        """
+        field_names = {field.name for field in django_model._meta.fields}
+        if not {"geometry", "city_district_name"} <= field_names:
+            return 0
+
+        district_model = DjangoORMUtils.get_django_model_class("KLCityDistrict")
+        table = connection.ops.quote_name(django_model._meta.db_table)
+        district_table = connection.ops.quote_name(district_model._meta.db_table)
+        pk = connection.ops.quote_name(django_model._meta.pk.column)
+
+        # District polygons are stored with their local (EPSG:25832) coordinates
+        district_srid = int(DEFAULT_LOCAL_CRS.split(":")[1])
+        target_srid = int(TARGET_CRS.split(":")[1])
+
+        sql = f"""
+            UPDATE {table} AS t
+            SET city_district_name = CASE
+                WHEN t.geometry IS NULL THEN %s
+                ELSE COALESCE(agg.names, %s)
+            END
+            FROM (
+                SELECT f.{pk} AS id, string_agg(DISTINCT d.name, ', ' ORDER BY d.name) AS names
+                FROM {table} AS f
+                LEFT JOIN {district_table} AS d
+                    ON ST_Intersects(
+                        f.geometry,
+                        ST_Transform(ST_SetSRID(d.geometry, %s), %s)
+                    )
+                WHERE f.insert_timestamp = %s
+                GROUP BY f.{pk}
+            ) AS agg
+            WHERE t.{pk} = agg.id
+        """
+        params = [
+            UNKNOWN_DISTRICT_NAME,
+            OUTSIDE_DISTRICT_NAME,
+            district_srid,
+            target_srid,
+            insert_ts,
+        ]
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return cursor.rowcount
+
+    @staticmethod
+    def update_lod_geometries(django_model, insert_ts):
+        """
+        Fills the `LOD_LEVELS` geometry columns of all records inserted at
+        `insert_ts` with `ST_SimplifyPreserveTopology` of `geometry`.
+        Tolerances are given in metres, geographic coordinates are simplified
+        in the local metric CRS (EPSG:25832) and transformed back.
+
+        Returns the number of updated records.
+        """
+        lod_levels = getattr(django_model, "LOD_LEVELS", None)
+        if not lod_levels:
+            return 0
+
+        geometry_field = django_model._meta.get_field("geometry")
+        # Models may store coordinates of another CRS than the field declares
+        stored_srid = getattr(django_model, "STORED_GEOMETRY_SRID", geometry_field.srid)
+        metric_srid = int(DEFAULT_LOCAL_CRS.split(":")[1])
+        if stored_srid == geometry_field.srid and geometry_field.geodetic(connection):
+            simplified = (
+                f"ST_Transform(ST_SimplifyPreserveTopology(ST_Transform(geometry, {metric_srid}), %s), "
+                f"{geometry_field.srid})"
+            )
+        else:
+            simplified = "ST_SimplifyPreserveTopology(geometry, %s)"
+
+        table = connection.ops.quote_name(django_model._meta.db_table)
+        assignments = []
+        params = []
+        for field_name, tolerance, _max_zoom in lod_levels:
+            column = connection.ops.quote_name(django_model._meta.get_field(field_name).column)
+            assignments.append(f"{column} = {simplified}")
+            params.append(tolerance)
+
+        sql = f"""
+            UPDATE {table}
+            SET {", ".join(assignments)}
+            WHERE insert_timestamp = %s AND geometry IS NOT NULL
+        """
+        params.append(insert_ts)
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return cursor.rowcount
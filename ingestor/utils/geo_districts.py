@@ -16,17 +16,22 @@
 # Authors: Benjamin Bischke
 
 import os.path
+import numpy as np
 import pandas as pd
 import requests
 import geopandas as gpd
 import logging
+import shapely
 from shapely.ops import unary_union
+from shapely.strtree import STRtree
 from geopandas.tools import sjoin
 from shapely.geometry import shape
 from shapely.geometry import Point, Polygon, MultiPolygon
+from shapely.geometry.base import BaseGeometry
 from shapely.wkb import loads as load_wkb
 from pyproj import CRS
 from ingestor.utils.geo import clean_geometries
+from ingestor.config.env_config import ASSIGN_DISTRICTS_IN_DB
 from ingestor.datapipe.utils.django_integration import get_django_model
 
 logger = logging.getLogger("webapp")
@@ -34,6 +39,9 @@ logger = logging.getLogger("webapp")
 DEFAULT_LOCAL_CRS = "EPSG:25832"
 TARGET_CRS = "EPSG:4326"
 
+UNKNOWN_DISTRICT_NAME = "Unbekannt"
+OUTSIDE_DISTRICT_NAME = "Kreis Kaiserslautern"
+
 
 def _get_local_aea(center_lat: float, center_lon: float) -> CRS:
     """
@@ -115,8 +123,79 @@ def load_districts():
     
 
 
+class CityDistrictIndex(object):
+    """
+    In-memory spatial index over the city districts.
+
+    District polygons are prepared once and stored in a STRtree, so that
+    looking up the districts of many geometries only costs a bounding box
+    query plus a prepared intersects test per candidate.
+    """
+
+    def __init__(self, districts: gpd.GeoDataFrame):
+        self.districts = districts
+        self._names = np.asarray(districts["Name"].to_numpy(), dtype=object)
+        self._geometries = np.asarray(districts.geometry.to_numpy(), dtype=object)
+        shapely.prepare(self._geometries)
+        self._tree = STRtree(self._geometries)
+
+    @classmethod
+    def load(cls):
+        return cls(load_districts())
+
+    @property
+    def empty(self):
+        return len(self._geometries) == 0
+
+    def get_district_names(self, geometries):
+        """
+        Return an array with the (comma separated) district names for each
+        of the given geometries in EPSG:4326.
+        """
+        geoms = np.asarray(list(geometries), dtype=object)
+        result = np.full(len(geoms), OUTSIDE_DISTRICT_NAME, dtype=object)
+        if len(geoms) == 0:
+            return result
+
+        missing = np.array([not isinstance(g, BaseGeometry) for g in geoms], dtype=bool)
+        result[missing] = UNKNOWN_DISTRICT_NAME
+        geoms[missing] = None
+        if self.empty:
+            return result
+
+        # Bounding box candidates from the tree, exact test on prepared districts
+        input_idx, tree_idx = self._tree.query(geoms)
+        hits = shapely.intersects(self._geometries[tree_idx], geoms[input_idx])
+
+        matches = {}
+        for i, j in zip(input_idx[hits], tree_idx[hits]):
+            matches.setdefault(i, set()).add(self._names[j])
+        for i, names in matches.items():
+            result[i] = ", ".join(sorted(names))
+        return result
+
+
 class CityDistrictsDecoder(object):
 
+    _district_index = None
+
+    @classmethod
+    def get_district_index(cls) -> CityDistrictIndex:
+        """
+        Return the district index, loading it from the database on first use.
+        """
+        if cls._district_index is None:
+            cls._district_index = CityDistrictIndex.load()
+        return cls._district_index
+
+    @classmethod
+    def reset_district_index(cls):
+        """
+        Drop the cached district index, e.g. at the start of a pipeline run
+        or after the districts were re-imported.
+        """
+        cls._district_index = None
+
     @staticmethod
     def _to_target_crs(geom):
         """
@@ -133,18 +212,40 @@ class CityDistrictsDecoder(object):
             return gpd.GeoSeries([geom]).set_crs(geom.crs).to_crs(4326).iloc[0]
         return geom
     
-    @staticmethod
-    def get_district_name_for_geometry(geom):
-        districts = load_districts()
-        if geom is None or districts is None:
-            return "Unbekannt"
-        
-        geom_wgs = CityDistrictsDecoder._to_target_crs(geom)
-        names = districts.loc[districts.geometry.intersects(geom_wgs), "Name"].unique()
-        return ", ".join(sorted(names)) if names.size else "Kreis Kaiserslautern"
+    @classmethod
+    def get_district_name_for_geometry(cls, geom):
+        if geom is None:
+            return UNKNOWN_DISTRICT_NAME
+        return cls.get_district_names_for_geometries([geom])[0]
 
-    @staticmethod
-    def filter_points_by_city_polygon(geoms_proj: gpd.GeoDataFrame,
+    @classmethod
+    def get_district_names_for_geometries(cls, geoms):
+        """
+        Bulk variant of `get_district_name_for_geometry`, returns an array
+        of district names in the same order as the given geometries.
+        """
+        if isinstance(geoms, gpd.GeoSeries) and geoms.crs and geoms.crs != TARGET_CRS:
+            geoms = geoms.to_crs(TARGET_CRS)
+        geoms_wgs = [CityDistrictsDecoder._to_target_crs(geom) for geom in geoms]
+        return cls.get_district_index().get_district_names(geoms_wgs)
+
+    @classmethod
+    def add_district_names(cls, rows, geometry_key="geometry"):
+        """
+        Set `city_district_name` on all rows in a single bulk lookup.
+        Skipped if the districts are assigned by the database after import.
+        """
+        if ASSIGN_DISTRICTS_IN_DB:
+            return rows
+        names = cls.get_district_names_for_geometries(
+            [row[geometry_key] for row in rows]
+        )
+        for row, name in zip(rows, names):
+            row["city_district_name"] = name
+        return rows
+
+    @classmethod
+    def filter_points_by_city_polygon(cls, geoms_proj: gpd.GeoDataFrame,
                                       buffer_km: float = 0):
         """
         Returns geometries that lie *within* the city‑district polygons, optionally
@@ -158,7 +259,7 @@ class CityDistrictsDecoder(object):
             Radial buffer (in kilometres) to enlarge the polygons before testing.
         """
         # ── Ensure CRS for polygons & points ───────────────────────────────
-        districts = load_districts()
+        districts = cls.get_district_index().districts
         if districts is None or districts.empty:
             logger.info("No districts found for filtering step, returning original data!")
             return geoms_proj
@@ -201,4 +302,3 @@ class CityDistrictsDecoder(object):
 
         # ── Return to original CRS of incoming points ──────────────────────
         return joined.to_crs(pts_orig_crs)
-    
\ No newline at end of file
@@ -22,3 +22,6 @@ class FrontendConfigConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'frontend_config'
     verbose_name = "Frontend"
+
+    def ready(self):
+        import frontend_config.signals  # noqa
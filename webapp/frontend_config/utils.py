@@ -17,13 +17,110 @@
 
 from frontend_config.model_field_config import ModelConfig, ModelFieldConfig
 from django.core.exceptions import ObjectDoesNotExist, MultipleObjectsReturned
+from django.conf import settings
 
 import logging
+import threading
+import time
 
 logger = logging.getLogger("webapp")
 
+# Redis key of the config version shared by all worker processes
+MODEL_CONFIG_VERSION_KEY = "frontend_config:model_config_version"
+
+# Seconds between two checks of the shared config version
+MODEL_CONFIG_VERSION_CHECK_INTERVAL = 5
+
+_mapping_cache = {}
+_mapping_cache_lock = threading.Lock()
+_local_version = 0
+_shared_version = None
+_shared_version_checked_at = 0.0
+_redis_client = None
+
+
+def _get_redis_client():
+    global _redis_client
+    if _redis_client is None:
+        import redis
+        _redis_client = redis.Redis.from_url(settings.REDIS_URL, socket_timeout=1)
+    return _redis_client
+
+
+def _read_shared_version():
+    try:
+        return int(_get_redis_client().get(MODEL_CONFIG_VERSION_KEY) or 0)
+    except Exception as e:
+        logger.warning(f"Could not read shared model config version: {e}")
+        return None
+
+
+def get_model_config_version():
+    """
+    Return a version token that changes whenever a ModelConfig or ModelFieldConfig
+    is saved or deleted. Cached field mappings are dropped on a version change.
+    With MODEL_CONFIG_CACHE_SHARED the token is the Redis version, identical in
+    all worker processes (it is part of ETags), otherwise a per-process counter.
+    """
+    global _shared_version, _shared_version_checked_at
+
+    if settings.MODEL_CONFIG_CACHE_SHARED:
+        now = time.monotonic()
+        if now - _shared_version_checked_at > MODEL_CONFIG_VERSION_CHECK_INTERVAL:
+            _shared_version_checked_at = now
+            version = _read_shared_version()
+            if version is not None and version != _shared_version:
+                if _shared_version is not None:
+                    _mapping_cache.clear()
+                _shared_version = version
+        return str(_shared_version or 0)
+    return str(_local_version)
+
+
+def invalidate_model_field_mapping_cache():
+    """Drop all cached field mappings, in all processes if Redis is enabled."""
+    global _local_version, _shared_version_checked_at
+
+    with _mapping_cache_lock:
+        _mapping_cache.clear()
+        _local_version += 1
+
+    if settings.MODEL_CONFIG_CACHE_SHARED:
+        try:
+            _get_redis_client().incr(MODEL_CONFIG_VERSION_KEY)
+        except Exception as e:
+            logger.warning(f"Could not publish model config change: {e}")
+        # Re-read the shared version with the next lookup
+        _shared_version_checked_at = 0.0
+
 
 def get_model_field_mapping(model_class):
+    """
+    Return dynamic MAP_FIELDS and visible object name, cached per model until
+    the model configuration changes (see `invalidate_model_field_mapping_cache`).
+    """
+    get_model_config_version()
+
+    key = model_class._meta.label_lower
+    cached = _mapping_cache.get(key)
+    if cached is None:
+        try:
+            cached = _load_model_field_mapping(model_class)
+        except Exception as e:
+            # Serve the class defaults but retry loading the config next time
+            logger.exception(f"Error loading ModelConfig for {key}: {e}")
+            return (
+                getattr(model_class, "MAP_FIELDS", {}).copy(),
+                getattr(model_class, "VISIBLE_OBJECT_NAME", ""),
+            )
+        with _mapping_cache_lock:
+            _mapping_cache[key] = cached
+
+    mapping, visible_object_name = cached
+    return mapping.copy(), visible_object_name
+
+
+def _load_model_field_mapping(model_class):
     """
     Return dynamic MAP_FIELDS and visible object name from DB or fall back to class attributes.
 
@@ -31,7 +128,6 @@ def get_model_field_mapping(model_class):
     - No DB config found
     - Multiple configs found
     - Missing or invalid field configs
-    - Falls back to class defaults cleanly
     """
 
     app_label = "lautrer_wissen"
@@ -41,37 +137,33 @@ def get_model_field_mapping(model_class):
     base_map_fields = getattr(model_class, "MAP_FIELDS", {})
     mapping = base_map_fields.copy()
 
-    try:
-        configs = (
-            ModelConfig.objects.filter(app_label=app_label, model_name=model_name)
-            .prefetch_related("fields")
-        )
-
-        if not configs.exists():
-            logger.debug(f"No ModelConfig found for {app_label}.{model_name}; using defaults.")
-            return mapping, visible_object_name
-
-        config = configs.first()
-
-        # Apply visible name override if provided
-        if config.object_display_name:
-            visible_object_name = config.object_display_name
-
-        # Apply per-field overrides
-        for field_conf in config.fields.all():
-            # Skip broken configs
-            if not hasattr(field_conf, "field_name"):
-                logger.warning(f"Ignoring invalid field config on {config}: {field_conf}")
-                continue
-
-            if not field_conf.visible:
-                mapping.pop(field_conf.field_name, None)
-            else:
-                mapping[field_conf.field_name] = (
-                    field_conf.display_name
-                    or mapping.get(field_conf.field_name, field_conf.field_name)
-                )
-    except Exception as e:
-        logger.exception(f"Error loading ModelConfig for {app_label}.{model_name}: {e}")
+    configs = (
+        ModelConfig.objects.filter(app_label=app_label, model_name=model_name)
+        .prefetch_related("fields")
+    )
+
+    config = configs.first()
+    if config is None:
+        logger.debug(f"No ModelConfig found for {app_label}.{model_name}; using defaults.")
+        return mapping, visible_object_name
+
+    # Apply visible name override if provided
+    if config.object_display_name:
+        visible_object_name = config.object_display_name
+
+    # Apply per-field overrides
+    for field_conf in config.fields.all():
+        # Skip broken configs
+        if not hasattr(field_conf, "field_name"):
+            logger.warning(f"Ignoring invalid field config on {config}: {field_conf}")
+            continue
+
+        if not field_conf.visible:
+            mapping.pop(field_conf.field_name, None)
+        else:
+            mapping[field_conf.field_name] = (
+                field_conf.display_name
+                or mapping.get(field_conf.field_name, field_conf.field_name)
+            )
 
     return mapping, visible_object_name
@@ -19,6 +19,9 @@ from django.contrib import admin
 from django.db import models
 from ..forms import GeoForm
 from frontend_config.utils import get_model_field_mapping
+from ..post_import import invalidate_derived_data
+from ..changelog import bump_data_version, record_admin_changes
+from ..models import FeatureChange
 
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
@@ -28,7 +31,40 @@ from django.contrib.auth.admin import GroupAdmin
 from django import forms
 
 
-class CustomAdmin(admin.ModelAdmin):
+class ChangeTrackingAdminMixin:
+    """
+    Records admin edits for delta sync (see lautrer_wissen.changelog) and
+    bumps the data version of the model, see ModelDataVersion. Done here
+    rather than in post_save/post_delete signals, which would also fire for
+    the cleanup deletes of imports and disable their fast deletes.
+    """
+
+    def _has_feature_keys(self):
+        return any(field.name == "feature_key" for field in self.model._meta.concrete_fields)
+
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        if self._has_feature_keys():
+            action = FeatureChange.UPDATED if change else FeatureChange.INSERTED
+            record_admin_changes(self.model, [(obj.feature_key, action)])
+        bump_data_version(self.model)
+
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        if self._has_feature_keys():
+            record_admin_changes(self.model, [(obj.feature_key, FeatureChange.DELETED)])
+        bump_data_version(self.model)
+
+    def delete_queryset(self, request, queryset):
+        keys = []
+        if self._has_feature_keys():
+            keys = list(queryset.values_list("feature_key", flat=True))
+        super().delete_queryset(request, queryset)
+        record_admin_changes(self.model, [(key, FeatureChange.DELETED) for key in keys])
+        bump_data_version(self.model)
+
+
+class CustomAdmin(ChangeTrackingAdminMixin, admin.ModelAdmin):
 
     def get_list_display(self, request):
 
@@ -39,9 +75,30 @@ class CustomAdmin(admin.ModelAdmin):
             return [
                 field.name for field in self.model._meta.get_fields()
                 if isinstance(field, models.Field) and not field.many_to_many and not field.one_to_many
+                and not field.generated
             ]
 
-class CustomGeoAdmin(CustomAdmin):
+class GeoSnapshotAdminMixin:
+    """
+    Drops the GeoJSON snapshot and the other data derived from the layer
+    after admin edits, it is rebuilt on the next request instead of during
+    the edit, see `invalidate_derived_data`.
+    """
+
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        invalidate_derived_data(self.model)
+
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        invalidate_derived_data(self.model)
+
+    def delete_queryset(self, request, queryset):
+        super().delete_queryset(request, queryset)
+        invalidate_derived_data(self.model)
+
+
+class CustomGeoAdmin(GeoSnapshotAdminMixin, CustomAdmin):
 
     form = GeoForm
     exclude = ("geometry",)
@@ -30,9 +30,10 @@ from reportlab.lib.units import inch
 from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Image
 from reportlab.lib.styles import getSampleStyleSheet
 from ..forms import GeoForm
+from .base import ChangeTrackingAdminMixin, GeoSnapshotAdminMixin
 
 
-class CustomAdminWithQR(admin.ModelAdmin):
+class CustomAdminWithQR(GeoSnapshotAdminMixin, ChangeTrackingAdminMixin, admin.ModelAdmin):
 
     form = GeoForm
     exclude = ("geometry",)
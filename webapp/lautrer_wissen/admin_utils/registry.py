@@ -27,6 +27,8 @@ app_models = apps.get_app_config('lautrer_wissen').get_models()
 
 
 for model in app_models:
+    if getattr(model, 'ADMIN_HIDDEN', False):
+        continue
     if model in MODELS_WITH_DETAIL_PAGE:
         admin_class = type(f'{model.__name__}AdminWithQR', (CustomAdminWithQR,), {'model': model})
     elif model in API_GEO_MODELS:
@@ -24,6 +24,7 @@ class LautrerWissenConfig(AppConfig):
     verbose_name = "Daten-Modelle"
 
     def ready(self):
+        import lautrer_wissen.signals  # noqa
         from django.apps import apps
         from django.conf import settings
 
@@ -0,0 +1,277 @@
+# Copyright (c) 2025 Vision Impulse GmbH
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# Authors: Benjamin Bischke
+
+from datetime import datetime, time
+
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Count, F
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework.exceptions import ValidationError
+
+from .models import FeatureChange, ImportRun, ModelDataVersion
+
+# Columns that change with every import without changing the feature
+BOOKKEEPING_FIELDS = {"insert_timestamp", "data_acquisition_date", "feature_key"}
+
+# `data_source` of the runs recording admin edits
+ADMIN_DATA_SOURCE = "admin"
+
+# Fields identifying a feature unless the model defines FEATURE_KEY_FIELDS
+DEFAULT_KEY_FIELDS = [
+    "gml_id", "global_id", "event_id", "gateway_id", "virtual_id", "type", "name",
+    "geometry", "latitude", "longitude",
+]
+
+
+def _column(model, field_name, alias="t"):
+    return f"{alias}.{connection.ops.quote_name(model._meta.get_field(field_name).column)}"
+
+
+def content_fields(model):
+    """Names of the fields whose values make up the content of a feature."""
+    lod_fields = {name for name, _, _ in getattr(model, "LOD_LEVELS", [])}
+    return [
+        field.name for field in model._meta.concrete_fields
+        if not field.primary_key and not field.generated
+        and field.name not in BOOKKEEPING_FIELDS | lod_fields
+    ]
+
+
+def key_fields(model):
+    """
+    Names of the fields identifying a feature across imports: the model's
+    FEATURE_KEY_FIELDS or source ids, name and location. Features without any
+    of them are identified by their full content.
+    """
+    field_names = {field.name for field in model._meta.concrete_fields}
+    fields = getattr(model, "FEATURE_KEY_FIELDS", None)
+    if fields is None:
+        fields = [name for name in DEFAULT_KEY_FIELDS if name in field_names]
+    return ["data_source", *fields] if fields else ["data_source", *content_fields(model)]
+
+
+def _hash_expression(model, field_names, alias="t"):
+    columns = ", ".join(_column(model, name, alias) for name in field_names)
+    return f"md5(ROW({columns})::text)"
+
+
+def assign_feature_keys(model, insert_ts):
+    """
+    Set `feature_key` of all records inserted at `insert_ts` to the hash of
+    their key fields. Records sharing the same key fields are numbered by
+    their content. Returns the number of updated records.
+    """
+    return _assign_feature_keys(model, "t.insert_timestamp = %s", [insert_ts])
+
+
+def assign_missing_feature_keys(model):
+    """
+    Assign feature keys to records without one, e.g. imported before keys
+    existed, the same way as `assign_feature_keys`, so the next import
+    reports them as updated or deleted. Returns the number of updated records.
+    """
+    return _assign_feature_keys(model, "t.feature_key IS NULL", [])
+
+
+def _assign_feature_keys(model, condition, params):
+    table = connection.ops.quote_name(model._meta.db_table)
+    pk = connection.ops.quote_name(model._meta.pk.column)
+    sql = f"""
+        UPDATE {table} AS t
+        SET feature_key = k.feature_key
+        FROM (
+            SELECT s.id, s.identity || '-' || row_number() OVER (
+                PARTITION BY s.identity, s.insert_timestamp ORDER BY s.content, s.id
+            ) AS feature_key
+            FROM (
+                SELECT
+                    t.{pk} AS id,
+                    t.insert_timestamp,
+                    {_hash_expression(model, key_fields(model))} AS identity,
+                    {_hash_expression(model, content_fields(model))} AS content
+                FROM {table} AS t
+                WHERE {condition}
+            ) AS s
+        ) AS k
+        WHERE t.{pk} = k.id
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.rowcount
+
+
+def record_feature_changes(model, outdated_queryset, insert_ts, data_source=None):
+    """
+    Compare the records inserted at `insert_ts` with the `outdated_queryset`
+    they replace and store the inserted, updated and deleted feature keys as
+    a new ImportRun. Must be called after `assign_feature_keys` and before
+    the outdated records are deleted. Returns the ImportRun.
+    """
+    run = ImportRun.objects.create(
+        model_name=model.__name__, data_source=data_source, insert_timestamp=insert_ts
+    )
+
+    table = connection.ops.quote_name(model._meta.db_table)
+    content = _hash_expression(model, content_fields(model))
+    outdated_sql, outdated_params = outdated_queryset.query.sql_with_params()
+    sql = f"""
+        INSERT INTO {connection.ops.quote_name(FeatureChange._meta.db_table)} (run_id, feature_key, action)
+        SELECT %s, COALESCE(new.feature_key, old.feature_key), CASE
+            WHEN old.feature_key IS NULL THEN %s
+            WHEN new.feature_key IS NULL THEN %s
+            ELSE %s
+        END
+        FROM (
+            SELECT t.feature_key, {content} AS content
+            FROM {table} AS t
+            WHERE t.insert_timestamp = %s
+        ) AS new
+        FULL OUTER JOIN (
+            SELECT DISTINCT ON (t.feature_key) t.feature_key, {content} AS content
+            FROM ({outdated_sql}) AS t
+            WHERE t.feature_key IS NOT NULL
+        ) AS old ON new.feature_key = old.feature_key
+        WHERE old.feature_key IS NULL OR new.feature_key IS NULL OR old.content <> new.content
+    """
+    params = [
+        run.pk, FeatureChange.INSERTED, FeatureChange.DELETED, FeatureChange.UPDATED,
+        insert_ts, *outdated_params,
+    ]
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+
+    counts = {
+        row["action"]: row["count"]
+        for row in run.changes.values("action").annotate(count=Count("pk"))
+    }
+    run.inserted_count = counts.get(FeatureChange.INSERTED, 0)
+    run.updated_count = counts.get(FeatureChange.UPDATED, 0)
+    run.deleted_count = counts.get(FeatureChange.DELETED, 0)
+    run.save(update_fields=["inserted_count", "updated_count", "deleted_count"])
+
+    prune_feature_changes(model)
+    return run
+
+
+def record_admin_changes(model, changes):
+    """
+    Store features changed outside of imports (admin edits) as a run, given
+    as (feature key, action) tuples, so delta sync clients receive them.
+    """
+    changes = [(key, action) for key, action in changes if key]
+    if not changes:
+        return None
+
+    run = ImportRun.objects.create(
+        model_name=model.__name__, data_source=ADMIN_DATA_SOURCE, insert_timestamp=timezone.now()
+    )
+    FeatureChange.objects.bulk_create(
+        FeatureChange(run=run, feature_key=key, action=action) for key, action in changes
+    )
+    run.inserted_count = sum(action == FeatureChange.INSERTED for _, action in changes)
+    run.updated_count = sum(action == FeatureChange.UPDATED for _, action in changes)
+    run.deleted_count = sum(action == FeatureChange.DELETED for _, action in changes)
+    run.save(update_fields=["inserted_count", "updated_count", "deleted_count"])
+
+    prune_feature_changes(model)
+    return run
+
+
+def prune_feature_changes(model):
+    """Drop the changes of all but the latest GEO_CHANGELOG_RETENTION_RUNS runs of `model`."""
+    runs = ImportRun.objects.filter(model_name=model.__name__, changes_pruned=False)
+    outdated = list(
+        runs.order_by("-pk").values_list("pk", flat=True)[settings.GEO_CHANGELOG_RETENTION_RUNS:]
+    )
+    if outdated:
+        FeatureChange.objects.filter(run_id__in=outdated).delete()
+        ImportRun.objects.filter(pk__in=outdated).update(changes_pruned=True)
+
+
+def parse_since(value):
+    """Parse `?since=` given as run id or ISO 8601 date/timestamp."""
+    if value.isdigit():
+        return int(value)
+
+    since = parse_datetime(value)
+    if since is None:
+        date = parse_date(value)
+        since = datetime.combine(date, time.min) if date else None
+    if since is None:
+        raise ValidationError({"since": "Expected a run id or an ISO 8601 timestamp."})
+    if timezone.is_naive(since):
+        since = timezone.make_aware(since)
+    return since
+
+
+def get_feature_changes(model, since):
+    """
+    Return the net changes of `model` after the run id or timestamp `since`:
+    {"run": id of the latest run, "reset": bool, "upserted": feature keys,
+    "deleted": feature keys}. With "reset" the changes are not available
+    (unknown or pruned runs) and the client has to replace all features.
+    """
+    runs = ImportRun.objects.filter(model_name=model.__name__)
+    latest_run = runs.order_by("-pk").values_list("pk", flat=True).first() or 0
+
+    if isinstance(since, datetime):
+        base_run = runs.filter(insert_timestamp__lte=since).order_by("-pk").first()
+    else:
+        base_run = runs.filter(pk__lte=since).order_by("-pk").first()
+
+    if base_run is None or runs.filter(pk__gt=base_run.pk, changes_pruned=True).exists():
+        return {"run": latest_run, "reset": True, "upserted": None, "deleted": []}
+
+    # The last change of each feature wins
+    actions = {}
+    changes = FeatureChange.objects.filter(run__model_name=model.__name__, run_id__gt=base_run.pk)
+    for feature_key, action in changes.order_by("run_id").values_list("feature_key", "action"):
+        actions[feature_key] = action
+
+    return {
+        "run": latest_run,
+        "reset": False,
+        "upserted": [key for key, action in actions.items() if action != FeatureChange.DELETED],
+        "deleted": [key for key, action in actions.items() if action == FeatureChange.DELETED],
+    }
+
+
+def bump_data_version(model):
+    """Mark the data of `model` as changed, see ModelDataVersion."""
+    versions = ModelDataVersion.objects.filter(model_name=model.__name__)
+    if versions.update(version=F("version") + 1, updated_at=timezone.now()):
+        return
+    try:
+        with transaction.atomic():
+            ModelDataVersion.objects.create(
+                model_name=model.__name__, version=1, updated_at=timezone.now()
+            )
+    except IntegrityError:
+        # Created concurrently
+        versions.update(version=F("version") + 1, updated_at=timezone.now())
+
+
+def get_data_version(model):
+    """Return the current data version of `model`, 0 before its first change."""
+    version = (
+        ModelDataVersion.objects.filter(model_name=model.__name__)
+        .values_list("version", flat=True)
+        .first()
+    )
+    return version or 0
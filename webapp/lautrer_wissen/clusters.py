@@ -0,0 +1,190 @@
+# Copyright (c) 2025 Vision Impulse GmbH
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# Authors: Benjamin Bischke
+
+import hashlib
+import math
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connection
+from django.db.models import Count, Max
+from rest_framework.exceptions import ValidationError
+
+from .changelog import get_data_version as get_model_data_version
+from .geo_sql import API_SRID, geometry_expression, id_expression, overlaps_expression
+
+# Half the circumference of the earth in EPSG:3857 metres
+WEB_MERCATOR_ORIGIN = 20037508.342789244
+MAX_LATITUDE = 85.0511287798
+
+# Grid cells per tile axis, 4 cells = 64 px cells on 256 px tiles
+CELLS_PER_TILE = 4
+
+# Maximum number of tiles per request
+MAX_TILES = 256
+
+
+def lon_to_tile_x(lon, zoom):
+    return int((lon + 180.0) / 360.0 * 2 ** zoom)
+
+
+def lat_to_tile_y(lat, zoom):
+    lat = max(min(lat, MAX_LATITUDE), -MAX_LATITUDE)
+    lat_rad = math.radians(lat)
+    return int((1.0 - math.asinh(math.tan(lat_rad)) / math.pi) / 2.0 * 2 ** zoom)
+
+
+def tile_x_to_lon(x, zoom):
+    return x / 2 ** zoom * 360.0 - 180.0
+
+
+def tile_y_to_lat(y, zoom):
+    return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * y / 2 ** zoom))))
+
+
+def get_tiles_for_bbox(bbox, zoom):
+    """Return all (x, y) tiles at `zoom` covering the bbox (EPSG:4326)."""
+    minx, miny, maxx, maxy = bbox
+    max_index = 2 ** zoom - 1
+    x_range = range(
+        max(lon_to_tile_x(minx, zoom), 0), min(lon_to_tile_x(maxx, zoom), max_index) + 1
+    )
+    y_range = range(
+        max(lat_to_tile_y(maxy, zoom), 0), min(lat_to_tile_y(miny, zoom), max_index) + 1
+    )
+    if len(x_range) * len(y_range) > MAX_TILES:
+        raise ValidationError({"bbox": "Bounding box too large for this zoom level."})
+    return [(x, y) for x in x_range for y in y_range]
+
+
+def _cache_key(model, zoom, x, y, filter_key, data_version):
+    return f"geo-clusters:{model._meta.model_name}:{data_version}:{filter_key}:{zoom}:{x}:{y}"
+
+
+def get_data_version(model):
+    """Cheap token changing with every import and admin edit of `model`."""
+    stats = model.objects.aggregate(last=Max("insert_timestamp"), count=Count("pk"))
+    token = f"{stats['last']}|{stats['count']}|{get_model_data_version(model)}"
+    return hashlib.md5(token.encode()).hexdigest()[:12]
+
+
+def _query_clusters(model, queryset, zoom, tiles):
+    """
+    Group the objects of `queryset` within the given tiles into grid cells
+    aligned to the tiles and return {(x, y): [cluster, ...]}. Geometries
+    stored in another SRID are transformed by `geometry_expression`.
+    """
+    geometry = geometry_expression(model)
+    cell_size = 2 * WEB_MERCATOR_ORIGIN / 2 ** zoom / CELLS_PER_TILE
+
+    min_x = min(x for x, _ in tiles)
+    max_x = max(x for x, _ in tiles)
+    min_y = min(y for _, y in tiles)
+    max_y = max(y for _, y in tiles)
+    envelope = (
+        tile_x_to_lon(min_x, zoom), tile_y_to_lat(max_y + 1, zoom),
+        tile_x_to_lon(max_x + 1, zoom), tile_y_to_lat(min_y, zoom),
+    )
+
+    # Only the location is needed, regardless of ?fields= or ?geometry=
+    location_fields = {"geometry", "latitude", "longitude", "virtual_id"}
+    queryset = queryset.only(
+        model._meta.pk.name,
+        *(field.name for field in model._meta.concrete_fields if field.name in location_fields),
+    )
+    inner_sql, inner_params = queryset.query.sql_with_params()
+    sql = f"""
+        WITH points AS (
+            SELECT
+                ST_Transform(ST_Centroid({geometry}), 3857) AS point,
+                {id_expression(model)} AS id
+            FROM ({inner_sql}) AS t
+            WHERE {geometry} IS NOT NULL
+              AND {overlaps_expression(model, f"ST_MakeEnvelope(%s, %s, %s, %s, {API_SRID})")}
+        ),
+        cells AS (
+            SELECT
+                point, id,
+                floor((ST_X(point) + %s) / %s)::int AS cell_x,
+                floor((%s - ST_Y(point)) / %s)::int AS cell_y
+            FROM points
+        )
+        SELECT
+            cell_x / {CELLS_PER_TILE}, cell_y / {CELLS_PER_TILE}, count(*),
+            ST_X(ST_Transform(ST_Centroid(ST_Collect(point)), {API_SRID})),
+            ST_Y(ST_Transform(ST_Centroid(ST_Collect(point)), {API_SRID})),
+            min(id)
+        FROM cells
+        WHERE cell_x BETWEEN %s AND %s AND cell_y BETWEEN %s AND %s
+        GROUP BY cell_x, cell_y
+    """
+    params = [
+        *inner_params,
+        *envelope,
+        WEB_MERCATOR_ORIGIN, cell_size,
+        WEB_MERCATOR_ORIGIN, cell_size,
+        min_x * CELLS_PER_TILE, (max_x + 1) * CELLS_PER_TILE - 1,
+        min_y * CELLS_PER_TILE, (max_y + 1) * CELLS_PER_TILE - 1,
+    ]
+
+    clusters = {tile: [] for tile in tiles}
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        for tile_x, tile_y, count, lon, lat, object_id in cursor.fetchall():
+            if (tile_x, tile_y) not in clusters:
+                continue
+            cluster = {
+                "type": "Feature",
+                "geometry": {"type": "Point", "coordinates": [lon, lat]},
+                "properties": {"count": count},
+            }
+            if count == 1:
+                cluster["properties"]["id"] = object_id
+            clusters[(tile_x, tile_y)].append(cluster)
+    return clusters
+
+
+def get_clusters(model, queryset, bbox, zoom, filter_params=""):
+    """
+    Return a FeatureCollection of grid clusters (count and centroid) of
+    `queryset` covering `bbox` at `zoom`. Clusters are cached per tile.
+    """
+    if geometry_expression(model) is None:
+        raise ValidationError({"detail": f"{model.__name__} has no geometry."})
+
+    tiles = get_tiles_for_bbox(bbox, zoom)
+    filter_key = hashlib.md5(filter_params.encode()).hexdigest()[:12]
+    data_version = get_data_version(model)
+
+    keys = {tile: _cache_key(model, zoom, *tile, filter_key, data_version) for tile in tiles}
+    cache = caches["geo_clusters"]
+    cached = cache.get_many(list(keys.values()))
+
+    clusters = {tile: cached[key] for tile, key in keys.items() if key in cached}
+    missing = [tile for tile in tiles if tile not in clusters]
+    if missing:
+        computed = _query_clusters(model, queryset, zoom, missing)
+        cache.set_many(
+            {keys[tile]: computed[tile] for tile in missing},
+            timeout=settings.GEO_CLUSTER_CACHE_TIMEOUT,
+        )
+        clusters.update(computed)
+
+    return {
+        "type": "FeatureCollection",
+        "features": [feature for tile in tiles for feature in clusters[tile]],
+    }
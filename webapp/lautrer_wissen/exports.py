@@ -0,0 +1,194 @@
+# Copyright (c) 2025 Vision Impulse GmbH
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# Authors: Benjamin Bischke
+
+import json
+import os
+import tempfile
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from pyogrio.raw import write_arrow
+from django.conf import settings
+from django.db import connection
+from django.http import FileResponse
+from rest_framework.exceptions import ValidationError
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+
+from .geo_sql import API_SRID, feature_id_field, geometry_expression, id_expression, property_fields
+
+INTEGER_FIELD_TYPES = {
+    "AutoField", "BigAutoField", "SmallAutoField", "IntegerField", "BigIntegerField",
+    "SmallIntegerField", "PositiveIntegerField", "PositiveBigIntegerField",
+    "PositiveSmallIntegerField",
+}
+
+# Column names used for the feature id and geometry in exported files
+RESERVED_COLUMN_NAMES = ("id", "geometry")
+
+
+class ExportRenderer(BaseRenderer):
+    """
+    Enables `?format=<format>` on the geo viewsets. The file itself is built
+    by `export_response`, only error responses pass through the renderer.
+    """
+
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if isinstance(data, bytes):
+            return data
+        return JSONRenderer().render(data)
+
+
+class FlatGeobufRenderer(ExportRenderer):
+    media_type = "application/flatgeobuf"
+    format = "fgb"
+
+
+class GeoParquetRenderer(ExportRenderer):
+    media_type = "application/vnd.apache.parquet"
+    format = "parquet"
+
+
+def arrow_column_type(field):
+    """Return (arrow type, SQL cast) used to export the values of `field`."""
+    internal_type = field.get_internal_type()
+    if internal_type in INTEGER_FIELD_TYPES:
+        return pa.int64(), "bigint"
+    if internal_type in ("FloatField", "DecimalField"):
+        return pa.float64(), "double precision"
+    if internal_type == "BooleanField":
+        return pa.bool_(), "boolean"
+    if internal_type == "DateTimeField":
+        return pa.timestamp("us", tz="UTC"), "timestamptz"
+    if internal_type == "DateField":
+        return pa.date32(), "date"
+    return pa.string(), "text"
+
+
+def build_export_query(model, queryset, lod_field=None, fields=None, include_geometry=True):
+    """
+    Return (sql, params, arrow schema) selecting the id, the configured
+    properties and the WKB geometry of `queryset`. Unlike the GeoJSON
+    endpoint, geometries are exported unmodified.
+    """
+    id_type, id_cast = arrow_column_type(feature_id_field(model))
+
+    columns = [f"{id_expression(model)}::{id_cast}"]
+    schema_fields = [pa.field("id", id_type)]
+
+    for field, name in property_fields(model, fields):
+        if name in RESERVED_COLUMN_NAMES:
+            continue
+        arrow_type, cast = arrow_column_type(field)
+        expression = f"t.{connection.ops.quote_name(field.column)}"
+        if cast == "text":
+            expression = f"NULLIF({expression}::text, '')"
+        else:
+            expression = f"{expression}::{cast}"
+        columns.append(expression)
+        schema_fields.append(pa.field(name, arrow_type))
+
+    metadata = None
+    if include_geometry:
+        columns.append(f"ST_AsBinary({geometry_expression(model, lod_field=lod_field)})")
+        schema_fields.append(pa.field("geometry", pa.binary()))
+        # GeoParquet metadata, coordinates are lon/lat (OGC:CRS84, the default)
+        metadata = {b"geo": json.dumps({
+            "version": "1.1.0",
+            "primary_column": "geometry",
+            "columns": {"geometry": {"encoding": "WKB", "geometry_types": []}},
+        }).encode("utf-8")}
+
+    inner_sql, inner_params = queryset.query.sql_with_params()
+    sql = f"SELECT {', '.join(columns)} FROM ({inner_sql}) AS t"
+    return sql, list(inner_params), pa.schema(schema_fields, metadata=metadata)
+
+
+def iter_record_batches(sql, params, schema, chunk_size=None):
+    """Yield the result of `sql` as arrow record batches of `chunk_size` rows."""
+    chunk_size = chunk_size or settings.GEO_STREAM_CHUNK_SIZE
+    with connection.chunked_cursor() as cursor:
+        cursor.execute(sql, params)
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            yield pa.RecordBatch.from_arrays(
+                [pa.array(values, type=field.type) for values, field in zip(zip(*rows), schema)],
+                schema=schema,
+            )
+
+
+def write_geoparquet(path, model, batches, schema):
+    """Write `batches` to a GeoParquet file, one row group per batch."""
+    with pq.ParquetWriter(path, schema, compression="zstd") as writer:
+        for batch in batches:
+            writer.write_batch(batch)
+
+
+def write_flatgeobuf(path, model, batches, schema):
+    """
+    Write `batches` to a FlatGeobuf file including its packed R-tree index,
+    which lets clients read single areas of the file with HTTP range requests.
+    """
+    write_arrow(
+        pa.RecordBatchReader.from_batches(schema, batches),
+        path,
+        layer=model._meta.model_name,
+        driver="FlatGeobuf",
+        geometry_name="geometry",
+        geometry_type="Unknown",
+        crs=f"EPSG:{API_SRID}",
+        layer_options={"SPATIAL_INDEX": "YES"},
+    )
+
+
+# Writer, content type and whether a geometry is required, per `?format=`
+EXPORT_FORMATS = {
+    FlatGeobufRenderer.format: (write_flatgeobuf, FlatGeobufRenderer.media_type, True),
+    GeoParquetRenderer.format: (write_geoparquet, GeoParquetRenderer.media_type, False),
+}
+
+
+def export_response(model, queryset, export_format, lod_field=None, fields=None, include_geometry=True):
+    """
+    Export `queryset` to a FlatGeobuf or GeoParquet file and return a response
+    streaming it. Rows are fetched in chunks through a server side cursor and
+    written batch by batch, so the layer is never held in memory as a whole.
+    """
+    writer, content_type, requires_geometry = EXPORT_FORMATS[export_format]
+    if requires_geometry and not include_geometry:
+        raise ValidationError({"geometry": f"Format '{export_format}' requires geometries."})
+    if include_geometry and geometry_expression(model) is None:
+        raise ValidationError({"detail": f"{model.__name__} has no geometry."})
+
+    sql, params, schema = build_export_query(
+        model, queryset, lod_field=lod_field, fields=fields, include_geometry=include_geometry
+    )
+    filename = f"{model._meta.model_name}.{export_format}"
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, filename)
+        writer(path, model, iter_record_batches(sql, params, schema), schema)
+        # The open handle keeps the file readable after the directory is removed
+        export_file = open(path, "rb")
+
+    return FileResponse(
+        export_file, content_type=content_type, as_attachment=True, filename=filename
+    )
@@ -0,0 +1,273 @@
+# Copyright (c) 2025 Vision Impulse GmbH
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# Authors: Benjamin Bischke
+
+from django.contrib.gis.geos import Polygon
+from django.contrib.postgres.search import SearchQuery
+from django.db import connection
+from django.db.models import BooleanField, ExpressionWrapper, Q
+from django.db.models.expressions import RawSQL
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend, SearchFilter
+
+from frontend_config.utils import get_model_field_mapping
+from .geo_sql import API_SRID, GEOJSON_MAX_DECIMAL_DIGITS, has_python_formatting, stored_geometry_srid
+
+MAX_ZOOM = 22
+TILE_SIZE = 256
+# Length of the equator in Web Mercator (EPSG:3857) metres
+EQUATOR_LENGTH_METRES = 40075016.686
+
+
+def parse_bbox(value):
+    """Parse `minx,miny,maxx,maxy` (EPSG:4326) into a tuple of floats."""
+    try:
+        bbox = tuple(float(v) for v in value.split(","))
+    except ValueError:
+        raise ValidationError({"bbox": "Expected 'minx,miny,maxx,maxy'."})
+    if len(bbox) != 4:
+        raise ValidationError({"bbox": "Expected 'minx,miny,maxx,maxy'."})
+    minx, miny, maxx, maxy = bbox
+    if minx > maxx or miny > maxy:
+        raise ValidationError({"bbox": "Min values must not exceed max values."})
+    return bbox
+
+
+def parse_zoom(value):
+    try:
+        zoom = int(value)
+    except ValueError:
+        raise ValidationError({"zoom": "Expected an integer zoom level."})
+    if not 0 <= zoom <= MAX_ZOOM:
+        raise ValidationError({"zoom": f"Zoom level must be between 0 and {MAX_ZOOM}."})
+    return zoom
+
+
+def get_requested_lod_field(request, model):
+    """
+    Return the LOD geometry field of `model` matching the `?tolerance=` (metres)
+    or `?zoom=` parameter of the request, or None for full resolution.
+    """
+    if not hasattr(model, "get_lod_field"):
+        return None
+
+    tolerance = request.query_params.get("tolerance")
+    if tolerance:
+        try:
+            tolerance = float(tolerance)
+        except ValueError:
+            raise ValidationError({"tolerance": "Expected a tolerance in metres."})
+        return model.get_lod_field(tolerance=tolerance)
+
+    zoom = request.query_params.get("zoom")
+    if zoom:
+        return model.get_lod_field(zoom=parse_zoom(zoom))
+    return None
+
+
+def get_requested_precision(request):
+    """
+    Return the number of coordinate decimal digits requested via `?precision=`
+    or None for the model default (6 digits are about 10 cm).
+    """
+    precision = request.query_params.get("precision")
+    if not precision:
+        return None
+    try:
+        precision = int(precision)
+    except ValueError:
+        raise ValidationError({"precision": "Expected a number of decimal digits."})
+    if not 0 <= precision <= GEOJSON_MAX_DECIMAL_DIGITS:
+        raise ValidationError(
+            {"precision": f"Precision must be between 0 and {GEOJSON_MAX_DECIMAL_DIGITS}."}
+        )
+    return precision
+
+
+def pixel_size_degrees(zoom):
+    """Approximate size of one map pixel in degrees at the given zoom level."""
+    return 360.0 / (TILE_SIZE * 2 ** zoom)
+
+
+def pixel_size_metres(zoom):
+    """Approximate size of one map pixel in metres at the given zoom level."""
+    return EQUATOR_LENGTH_METRES / (TILE_SIZE * 2 ** zoom)
+
+
+def stored_envelope(model, envelope):
+    """
+    Return the EPSG:4326 polygon `envelope` in the coordinates stored in the
+    `geometry` field of `model` (see STORED_GEOMETRY_SRID), labelled with the
+    SRID of the field so the comparison uses its spatial index.
+    """
+    srid = stored_geometry_srid(model)
+    if srid == API_SRID:
+        return envelope
+    envelope = envelope.transform(srid, clone=True)
+    envelope.srid = model._meta.get_field("geometry").srid
+    return envelope
+
+
+class BoundingBoxFilterBackend(BaseFilterBackend):
+    """
+    Restrict a queryset to the current map viewport.
+
+    ?bbox=minx,miny,maxx,maxy  Features whose bounding box overlaps the viewport
+                               (`geometry && ST_MakeEnvelope(...)`, GiST indexed).
+                               Models with only `latitude`/`longitude` columns are
+                               filtered by coordinate ranges instead.
+    ?zoom=<z>                  Drops line and polygon features smaller than one
+                               pixel at zoom level `z`.
+
+    Geometries stored in another SRID (see STORED_GEOMETRY_SRID) are compared
+    in their stored coordinates.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        field_names = {field.name for field in queryset.model._meta.fields}
+        has_geometry = "geometry" in field_names
+        has_lat_lon = {"latitude", "longitude"} <= field_names
+
+        bbox = request.query_params.get("bbox")
+        if bbox:
+            minx, miny, maxx, maxy = parse_bbox(bbox)
+            if has_geometry:
+                envelope = Polygon.from_bbox((minx, miny, maxx, maxy))
+                envelope.srid = API_SRID
+                envelope = stored_envelope(queryset.model, envelope)
+                queryset = queryset.filter(geometry__bboverlaps=envelope)
+            elif has_lat_lon:
+                queryset = queryset.filter(
+                    longitude__range=(minx, maxx), latitude__range=(miny, maxy)
+                )
+
+        zoom = request.query_params.get("zoom")
+        if zoom and has_geometry:
+            queryset = self.filter_small_features(queryset, parse_zoom(zoom))
+        return queryset
+
+    def filter_small_features(self, queryset, zoom):
+        model = queryset.model
+        pixel_size = pixel_size_degrees(zoom)
+        if stored_geometry_srid(model) != API_SRID:
+            pixel_size = pixel_size_metres(zoom)
+        geometry = "%s.%s" % (
+            connection.ops.quote_name(model._meta.db_table),
+            connection.ops.quote_name(model._meta.get_field("geometry").column),
+        )
+        visible = RawSQL(
+            f"({geometry} IS NULL OR GeometryType({geometry}) IN ('POINT', 'MULTIPOINT') "
+            f"OR GREATEST(ST_XMax({geometry}) - ST_XMin({geometry}), "
+            f"ST_YMax({geometry}) - ST_YMin({geometry})) >= %s)",
+            (pixel_size,),
+        )
+        return queryset.filter(ExpressionWrapper(visible, output_field=BooleanField()))
+
+
+# Fields dropped by `?geometry=false`
+GEOMETRY_FIELD_NAMES = ["geometry", "latitude", "longitude"]
+
+
+def get_requested_fields(request):
+    """Return the names given by `?fields=a,b,c` or None if all fields are requested."""
+    if request is None:
+        return None
+    value = request.query_params.get("fields")
+    if not value:
+        return None
+    return {name.strip() for name in value.split(",") if name.strip()}
+
+
+def is_geometry_requested(request):
+    """False for `?geometry=false`, features are returned without geometry."""
+    if request is None:
+        return True
+    return request.query_params.get("geometry", "").lower() not in ("false", "0", "no")
+
+
+def get_sparse_context(request):
+    """Serializer context entries for the `?fields=` and `?geometry=` parameters."""
+    return {
+        "fields": get_requested_fields(request),
+        "include_geometry": is_geometry_requested(request),
+    }
+
+
+class SparseFieldsFilterBackend(BaseFilterBackend):
+    """
+    Push `?fields=a,b,c` and `?geometry=false` down to the queryset by not
+    loading unrequested columns. Fields may be given by model field name or by
+    their configured display name. The serializers drop the same fields.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        model = queryset.model
+        fields = get_requested_fields(request)
+        include_geometry = is_geometry_requested(request)
+        if fields is None and include_geometry:
+            return queryset
+        # Formatting in Python may access arbitrary fields, load them all
+        if has_python_formatting(model):
+            return queryset
+
+        field_names = {field.name for field in model._meta.concrete_fields}
+        keep = {model._meta.pk.name} | ({"virtual_id", "feature_key"} & field_names)
+
+        if fields is not None:
+            fields_mapping, _ = get_model_field_mapping(model)
+            public_to_model = {public: name for name, public in fields_mapping.items()}
+            keep |= {public_to_model.get(name, name) for name in fields} & field_names
+        else:
+            keep |= field_names
+
+        geometry_fields = set(GEOMETRY_FIELD_NAMES)
+        geometry_fields |= {name for name, _, _ in getattr(model, "LOD_LEVELS", [])}
+        if include_geometry:
+            keep |= geometry_fields & field_names
+        else:
+            keep -= geometry_fields
+
+        deferred = field_names - keep
+        return queryset.defer(*deferred) if deferred else queryset
+
+
+class FullTextSearchFilter(SearchFilter):
+    """
+    `?search=` for models opting in with SEARCH_VECTOR_FIELDS: matches the
+    generated `search_vector` column (German stemming, GIN indexed) and, for
+    typos, the SEARCH_TRIGRAM_FIELDS by trigram word similarity (pg_trgm, GIN
+    indexed). Other models fall back to the `ILIKE` search of SearchFilter.
+    """
+
+    search_config = "german"
+
+    def filter_queryset(self, request, queryset, view):
+        model = queryset.model
+        if not getattr(model, "SEARCH_VECTOR_FIELDS", None):
+            return super().filter_queryset(request, queryset, view)
+
+        # The vector is only needed for filtering
+        queryset = queryset.defer("search_vector")
+        search_terms = " ".join(self.get_search_terms(request))
+        if not search_terms:
+            return queryset
+
+        condition = Q(search_vector=SearchQuery(
+            search_terms, config=self.search_config, search_type="websearch"
+        ))
+        for field_name in getattr(model, "SEARCH_TRIGRAM_FIELDS", []):
+            condition |= Q(**{f"{field_name}__trigram_word_similar": search_terms})
+        return queryset.filter(condition)
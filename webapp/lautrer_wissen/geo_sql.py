@@ -0,0 +1,288 @@
+# Copyright (c) 2025 Vision Impulse GmbH
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# Authors: Benjamin Bischke
+
+from django.conf import settings
+from django.db import connection, models
+
+from frontend_config.utils import get_model_field_mapping
+from .models import MODELS_WITH_DETAIL_PAGE
+
+# SRID of all geometries served by the API
+API_SRID = 4326
+
+
+def quote_alias(name):
+    """Quote a (display) name for use as SQL column alias."""
+    return '"%s"' % str(name).replace('"', '""')
+
+
+def stored_geometry_srid(model):
+    """
+    SRID of the coordinates stored in the `geometry` field of `model`, which
+    may differ from the SRID the field declares (see STORED_GEOMETRY_SRID).
+    """
+    return getattr(model, "STORED_GEOMETRY_SRID", model._meta.get_field("geometry").srid)
+
+
+def geometry_expression(model, alias="t", lod_field=None, transform=True):
+    """
+    SQL expression for the geometry of `model` in EPSG:4326. Models without a
+    `geometry` field are located by their `latitude`/`longitude` columns.
+    With `lod_field` the simplified geometry is used where it is available.
+    With `transform=False` the stored coordinates are returned as they are.
+    Returns None if the model has no location at all.
+    """
+    field_names = {field.name for field in model._meta.fields}
+    if "geometry" in field_names:
+        column = model._meta.get_field("geometry").column
+        geometry = f"{alias}.{connection.ops.quote_name(column)}"
+        if lod_field:
+            lod_column = model._meta.get_field(lod_field).column
+            geometry = f"COALESCE({alias}.{connection.ops.quote_name(lod_column)}, {geometry})"
+        srid = stored_geometry_srid(model)
+        if transform and srid != API_SRID:
+            geometry = f"ST_Transform(ST_SetSRID({geometry}, {srid}), {API_SRID})"
+        return geometry
+    if {"latitude", "longitude"} <= field_names:
+        lat = connection.ops.quote_name(model._meta.get_field("latitude").column)
+        lon = connection.ops.quote_name(model._meta.get_field("longitude").column)
+        return f"ST_SetSRID(ST_MakePoint({alias}.{lon}, {alias}.{lat}), {API_SRID})"
+    return None
+
+
+def overlaps_expression(model, envelope, alias="t"):
+    """
+    SQL condition for the geometry of `model` overlapping the bounding box of
+    the EPSG:4326 geometry `envelope`. The envelope is transformed to the
+    stored coordinates instead of the column, so the spatial index is used.
+    """
+    field_names = {field.name for field in model._meta.fields}
+    if "geometry" not in field_names:
+        return f"{geometry_expression(model, alias)} && {envelope}"
+
+    field = model._meta.get_field("geometry")
+    column = f"{alias}.{connection.ops.quote_name(field.column)}"
+    srid = stored_geometry_srid(model)
+    if srid != API_SRID:
+        envelope = f"ST_SetSRID(ST_Transform({envelope}, {srid}), {field.srid})"
+    return f"{column} && {envelope}"
+
+
+def feature_id_field(model):
+    """Model field holding the public feature id (virtual_id for detail pages)."""
+    field_names = {field.name for field in model._meta.fields}
+    if model in MODELS_WITH_DETAIL_PAGE and "virtual_id" in field_names:
+        return model._meta.get_field("virtual_id")
+    return model._meta.pk
+
+
+def id_expression(model, alias="t"):
+    """SQL expression for the public feature id (virtual_id for detail pages)."""
+    return f"{alias}.{connection.ops.quote_name(feature_id_field(model).column)}"
+
+
+def is_requested_field(model_field, response_field, fields=None):
+    """True if a property is part of the `?fields=` selection (model or public name)."""
+    return fields is None or model_field in fields or response_field in fields
+
+
+def property_fields(model, fields=None):
+    """
+    Return the configured concrete properties of `model` as a list of
+    (model field, public name) tuples, restricted to the `?fields=` selection.
+    """
+    fields_mapping, _ = get_model_field_mapping(model)
+
+    properties = []
+    for model_field, response_field in fields_mapping.items():
+        if not is_requested_field(model_field, response_field, fields):
+            continue
+        try:
+            field = model._meta.get_field(model_field)
+        except Exception:
+            continue
+        if not getattr(field, "concrete", False) or field.many_to_many:
+            continue
+        properties.append((field, response_field))
+    return properties
+
+
+def property_columns(model, alias="t", fields=None):
+    """
+    SQL select list entries for the configured properties of `model`,
+    following the same field mapping as `BaseGeoSerializer.get_properties`.
+    Empty strings are mapped to NULL since they are dropped from responses.
+    Returns a list of (sql expression, public name) tuples.
+    """
+    columns = []
+    for field, response_field in property_fields(model, fields):
+        expression = f"{alias}.{connection.ops.quote_name(field.column)}"
+        if isinstance(field, (models.CharField, models.TextField)):
+            expression = f"NULLIF({expression}, '')"
+        elif isinstance(field, models.DateTimeField):
+            expression = datetime_json_expression(expression)
+        elif isinstance(field, models.DecimalField):
+            # DRF's JSONEncoder renders decimals as floats
+            expression = f"{expression}::double precision"
+        columns.append((expression, response_field))
+    return columns
+
+
+def datetime_json_expression(expression):
+    """
+    Format a timestamp like DRF's JSONEncoder: ISO 8601 in UTC with a `Z`
+    suffix and microseconds only if the value has a fractional second.
+    """
+    utc = f"({expression} AT TIME ZONE 'UTC')"
+    return (
+        f"to_char({utc}, 'YYYY-MM-DD\"T\"HH24:MI:SS') "
+        f"|| CASE WHEN mod(extract(microseconds FROM {utc})::bigint, 1000000) <> 0 "
+        f"THEN to_char({utc}, '.US') ELSE '' END || 'Z'"
+    )
+
+
+def is_descending_ordering(model, queryset):
+    """
+    True if `queryset` is ordered by descending pk. The geo endpoint only
+    allows `?ordering=id` and `?ordering=-id`, features are ordered by pk.
+    """
+    descending_names = {"-id", "-pk", f"-{model._meta.pk.name}"}
+    return any(str(name) in descending_names for name in queryset.query.order_by)
+
+
+# Maximum number of decimal digits of coordinates rendered by PostGIS
+GEOJSON_MAX_DECIMAL_DIGITS = 15
+
+
+def get_coordinate_precision(model, precision=None):
+    """
+    Number of decimal digits of GeoJSON coordinates of `model`: the requested
+    `precision` (?precision=), the model's COORDINATE_PRECISION or the
+    GEO_COORDINATE_PRECISION setting, in this order.
+    """
+    if precision is None:
+        precision = getattr(model, "COORDINATE_PRECISION", None)
+    if precision is None:
+        precision = settings.GEO_COORDINATE_PRECISION
+    return min(precision, GEOJSON_MAX_DECIMAL_DIGITS)
+
+
+def has_python_formatting(model):
+    """
+    True if objects of `model` are formatted in Python when serialized
+    (wiki models, frontend links) or merged by geometry afterwards.
+    """
+    from .models.mixins import FrontendURLMixin
+    from .models.geo.wikipedia import WikiFormatMixin
+    from .views.viewset_geo import MERGED_FEATURE_MODELS
+
+    return (
+        issubclass(model, (FrontendURLMixin, WikiFormatMixin))
+        or model.__name__ in MERGED_FEATURE_MODELS
+    )
+
+
+def supports_sql_rendering(model):
+    """
+    True if the FeatureCollection of `model` can be built inside PostgreSQL
+    with the same result as `BaseGeoSerializer`.
+    """
+    if has_python_formatting(model):
+        return False
+    if geometry_expression(model) is None:
+        return False
+
+    fields_mapping, _ = get_model_field_mapping(model)
+    concrete_fields = {field.name for field in model._meta.concrete_fields}
+    return all(field_name in concrete_fields for field_name in fields_mapping)
+
+
+def geojson_geometry_expression(model, alias="t", lod_field=None, precision=None):
+    """
+    SQL expression rendering the geometry of `model` as GeoJSON, following the
+    rules of `BaseGeoSerializer.get_geometry`: multipolygons are reduced to
+    their largest polygon and polygons to their exterior ring. Coordinates are
+    rounded to `precision` decimal digits (see `get_coordinate_precision`).
+    """
+    # Stored coordinates like BaseGeoSerializer, which serves them untransformed
+    geometry = geometry_expression(model, alias, lod_field, transform=False)
+    digits = get_coordinate_precision(model, precision)
+
+    def ring(expression):
+        return (
+            f"json_build_object('type', 'Polygon', 'coordinates', "
+            f"(ST_AsGeoJSON(ST_ExteriorRing({expression}), {digits})::json)->'coordinates')"
+        )
+
+    largest_polygon = (
+        f"(SELECT dump.geom FROM ST_Dump({geometry}) AS dump "
+        f"ORDER BY ST_Area(dump.geom) DESC LIMIT 1)"
+    )
+    return f"""
+        CASE GeometryType({geometry})
+            WHEN 'POINT' THEN ST_AsGeoJSON({geometry}, {digits})::json
+            WHEN 'LINESTRING' THEN ST_AsGeoJSON({geometry}, {digits})::json
+            WHEN 'POLYGON' THEN {ring(geometry)}
+            WHEN 'MULTIPOLYGON' THEN {ring(largest_polygon)}
+        END
+    """
+
+
+def render_feature_collection_sql(model, queryset, lod_field=None, fields=None, include_geometry=True,
+                                  precision=None):
+    """
+    Render `queryset` as GeoJSON FeatureCollection inside PostgreSQL
+    (json_build_object/ST_AsGeoJSON/json_agg) and return the encoded JSON.
+    Only valid for models accepted by `supports_sql_rendering`.
+    """
+    _, visible_object_name = get_model_field_mapping(model)
+
+    columns = property_columns(model, fields=fields)
+    geometry = "NULL::json"
+    if include_geometry:
+        geometry = geojson_geometry_expression(model, lod_field=lod_field, precision=precision)
+
+    properties = ["'Objektart', %s::text"]
+    properties.extend(f"%s::text, {expression}" for expression, _ in columns)
+    properties.append(f"'id', {id_expression(model)}")
+    property_names = [name for _, name in columns]
+
+    # Features are aggregated in pk order like the DRF path, the ORDER BY of
+    # the queryset itself would not be kept by json_agg
+    direction = " DESC" if is_descending_ordering(model, queryset) else ""
+    pk = f"t.{connection.ops.quote_name(model._meta.pk.column)}"
+    inner_sql, inner_params = queryset.order_by().query.sql_with_params()
+    sql = f"""
+        SELECT json_build_object(
+            'type', 'FeatureCollection',
+            'features', COALESCE(json_agg(f.feature ORDER BY f.ordering{direction}), '[]'::json)
+        )::text
+        FROM (
+            SELECT {pk} AS ordering, json_build_object(
+                'id', {id_expression(model)},
+                'type', 'Feature',
+                'geometry', {geometry},
+                'properties', json_strip_nulls(json_build_object({", ".join(properties)}))
+            ) AS feature
+            FROM ({inner_sql}) AS t
+        ) AS f
+    """
+    params = [visible_object_name or None, *property_names, *inner_params]
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.fetchone()[0].encode("utf-8")
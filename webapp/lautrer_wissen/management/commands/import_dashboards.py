@@ -21,6 +21,7 @@ import yaml
 from django.core.management.base import BaseCommand
 from django.contrib.gis.geos import Point
 from lautrer_wissen.models.geo.kl import KLSensorGrafanaDashboard
+from lautrer_wissen.post_import import refresh_derived_data
 from settings_seedfiles import SEED_FILES
 
 logger = logging.getLogger("webapp")
@@ -50,6 +51,7 @@ class Command(BaseCommand):
             logger.info("Deleting existing dashboards data.")
             KLSensorGrafanaDashboard.objects.all().delete()
         self._import_dashboards()
+        refresh_derived_data(KLSensorGrafanaDashboard)
 
     def _import_dashboards(self):
         with open(SEED_FILES["dashboard_data_file"], "r") as f:
@@ -0,0 +1,124 @@
+# Copyright (c) 2025 Vision Impulse GmbH
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# Authors: Benjamin Bischke
+
+import json
+import logging
+
+from django.contrib.gis.geos import GEOSGeometry
+from django.db import connection, transaction
+from django.utils.timezone import now
+from rest_framework.renderers import JSONRenderer
+
+from .models import MergedGeoFeature
+
+logger = logging.getLogger("webapp")
+
+
+def is_merged_model(model):
+    from .views.viewset_geo import MERGED_FEATURE_MODELS
+    return model.__name__ in MERGED_FEATURE_MODELS
+
+
+def _lock_merged_features(model):
+    """Serialize writers of the merged features of `model` until the end of the transaction."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT pg_advisory_xact_lock(hashtext(%s))", [f"merged-features:{model.__name__}"]
+        )
+
+
+def store_merged_features(model, feature_collection):
+    """Replace the stored merged features of `model`."""
+    insert_ts = now()
+    records = []
+    for feature in feature_collection["features"]:
+        # Serialize with DRF to get plain JSON types (dates, decimals, ...)
+        feature = json.loads(JSONRenderer().render(feature))
+        geometry = feature.get("geometry")
+        records.append(
+            MergedGeoFeature(
+                model_name=model.__name__,
+                geometry=GEOSGeometry(json.dumps(geometry), srid=4326) if geometry else None,
+                feature=feature,
+                insert_timestamp=insert_ts,
+            )
+        )
+
+    with transaction.atomic():
+        _lock_merged_features(model)
+        MergedGeoFeature.objects.filter(model_name=model.__name__).delete()
+        MergedGeoFeature.objects.bulk_create(records, batch_size=1000)
+    return len(records)
+
+
+def refresh_merged_features(model):
+    """
+    Serialize and merge all objects of `model` and store the resulting
+    features. Called after imports, see `refresh_derived_data`, and on first
+    use after admin edits.
+    """
+    if not is_merged_model(model):
+        return None
+
+    from .views.viewset_geo import get_geo_queryset, render_feature_collection
+
+    data = render_feature_collection(model, get_geo_queryset(model))
+    count = store_merged_features(model, data)
+    logger.info("Stored %s merged features for %s", count, model.__name__)
+    return count
+
+
+def invalidate_merged_features(model):
+    """Drop the merged features of `model`, they are rebuilt on the next request."""
+    MergedGeoFeature.objects.filter(model_name=model.__name__).delete()
+
+
+def build_missing_merged_features(model):
+    """
+    Build the merged features of `model` if they are missing, e.g. after an
+    invalidation. Concurrent requests wait for the first one instead of
+    building them again. Layers without objects are not rebuilt.
+    """
+    from .views.viewset_geo import get_geo_queryset
+
+    with transaction.atomic():
+        _lock_merged_features(model)
+        if MergedGeoFeature.objects.filter(model_name=model.__name__).exists():
+            return
+        if not get_geo_queryset(model).exists():
+            return
+        refresh_merged_features(model)
+
+
+def merged_feature_collection(model, request=None, view=None):
+    """
+    Return the FeatureCollection of `model` from the stored merged features,
+    restricted by the bbox/zoom parameters of `request`.
+    """
+    from .filters import BoundingBoxFilterBackend
+
+    queryset = MergedGeoFeature.objects.filter(model_name=model.__name__)
+    if not queryset.exists():
+        build_missing_merged_features(model)
+
+    if request is not None:
+        queryset = BoundingBoxFilterBackend().filter_queryset(request, queryset, view)
+
+    return {
+        "type": "FeatureCollection",
+        "features": list(queryset.order_by("id").values_list("feature", flat=True)),
+    }
@@ -0,0 +1,89 @@
+# Generated by Django 5.1.15 on 2026-10-18 10:00
+
+import django.contrib.gis.db.models.fields
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lautrer_wissen', '0004_demographicdata_data_acquisition_date_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='klcitydistrict',
+            name='geometry_lod1',
+            field=django.contrib.gis.db.models.fields.GeometryField(blank=True, null=True, srid=4326),
+        ),
+        migrations.AddField(
+            model_name='klcitydistrict',
+            name='geometry_lod2',
+            field=django.contrib.gis.db.models.fields.GeometryField(blank=True, null=True, srid=4326),
+        ),
+        migrations.AddField(
+            model_name='klcitydistrict',
+            name='geometry_lod3',
+            field=django.contrib.gis.db.models.fields.GeometryField(blank=True, null=True, srid=4326),
+        ),
+        migrations.AddField(
+            model_name='klparkingzone',
+            name='geometry_lod1',
+            field=django.contrib.gis.db.models.fields.GeometryField(blank=True, null=True, srid=4326),
+        ),
+        migrations.AddField(
+            model_name='klparkingzone',
+            name='geometry_lod2',
+            field=django.contrib.gis.db.models.fields.GeometryField(blank=True, null=True, srid=4326),
+        ),
+        migrations.AddField(
+            model_name='klparkingzone',
+            name='geometry_lod3',
+            field=django.contrib.gis.db.models.fields.GeometryField(blank=True, null=True, srid=4326),
+        ),
+        migrations.AddField(
+            model_name='kllanduseplan',
+            name='geometry_lod1',
+            field=django.contrib.gis.db.models.fields.GeometryField(blank=True, null=True, srid=4326),
+        ),
+        migrations.AddField(
+            model_name='kllanduseplan',
+            name='geometry_lod2',
+            field=django.contrib.gis.db.models.fields.GeometryField(blank=True, null=True, srid=4326),
+        ),
+        migrations.AddField(
+            model_name='kllanduseplan',
+            name='geometry_lod3',
+            field=django.contrib.gis.db.models.fields.GeometryField(blank=True, null=True, srid=4326),
+        ),
+        migrations.AddField(
+            model_name='osmcemetery',
+            name='geometry_lod1',
+            field=django.contrib.gis.db.models.fields.GeometryField(blank=True, null=True, srid=4326),
+        ),
+        migrations.AddField(
+            model_name='osmcemetery',
+            name='geometry_lod2',
+            field=django.contrib.gis.db.models.fields.GeometryField(blank=True, null=True, srid=4326),
+        ),
+        migrations.AddField(
+            model_name='osmcemetery',
+            name='geometry_lod3',
+            field=django.contrib.gis.db.models.fields.GeometryField(blank=True, null=True, srid=4326),
+        ),
+        migrations.AddField(
+            model_name='osmnaturereserve',
+            name='geometry_lod1',
+            field=django.contrib.gis.db.models.fields.GeometryField(blank=True, null=True, srid=4326),
+        ),
+        migrations.AddField(
+            model_name='osmnaturereserve',
+            name='geometry_lod2',
+            field=django.contrib.gis.db.models.fields.GeometryField(blank=True, null=True, srid=4326),
+        ),
+        migrations.AddField(
+            model_name='osmnaturereserve',
+            name='geometry_lod3',
+            field=django.contrib.gis.db.models.fields.GeometryField(blank=True, null=True, srid=4326),
+        ),
+    ]
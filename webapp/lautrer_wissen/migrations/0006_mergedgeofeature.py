@@ -0,0 +1,24 @@
+# Generated by Django 5.1.15 on 2026-10-18 10:30
+
+import django.contrib.gis.db.models.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lautrer_wissen', '0005_lod_geometries'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MergedGeoFeature',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model_name', models.CharField(db_index=True, max_length=100)),
+                ('geometry', django.contrib.gis.db.models.fields.GeometryField(blank=True, null=True, srid=4326)),
+                ('feature', models.JSONField()),
+                ('insert_timestamp', models.DateTimeField(null=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 5.1.15 on 2026-10-18 13:00
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lautrer_wissen', '0007_feature_changelog'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name='klcouncilevent',
+            name='search_vector',
+            field=models.GeneratedField(db_persist=True, expression=django.contrib.postgres.search.SearchVector('title', 'committee', config='german'), output_field=django.contrib.postgres.search.SearchVectorField()),
+        ),
+        migrations.AddField(
+            model_name='klleisureevent',
+            name='search_vector',
+            field=models.GeneratedField(db_persist=True, expression=django.contrib.postgres.search.SearchVector('caption', 'caption_addition', 'description', config='german'), output_field=django.contrib.postgres.search.SearchVectorField()),
+        ),
+        migrations.AddField(
+            model_name='wgaevent',
+            name='search_vector',
+            field=models.GeneratedField(db_persist=True, expression=django.contrib.postgres.search.SearchVector('title', 'subtitle', 'description', config='german'), output_field=django.contrib.postgres.search.SearchVectorField()),
+        ),
+        migrations.AddIndex(
+            model_name='klcouncilevent',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='klcouncilevent_search_gin'),
+        ),
+        migrations.AddIndex(
+            model_name='klcouncilevent',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['title'], name='klcouncilevent_title_trgm', opclasses=['gin_trgm_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='klleisureevent',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='klleisureevent_search_gin'),
+        ),
+        migrations.AddIndex(
+            model_name='klleisureevent',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['caption'], name='klleisureevent_caption_trgm', opclasses=['gin_trgm_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='wgaevent',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='wgaevent_search_gin'),
+        ),
+        migrations.AddIndex(
+            model_name='wgaevent',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['title'], name='wgaevent_title_trgm', opclasses=['gin_trgm_ops']),
+        ),
+    ]
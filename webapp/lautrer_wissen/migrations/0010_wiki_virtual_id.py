@@ -0,0 +1,24 @@
+# Generated by Django 5.1.15 on 2026-10-18 15:00
+
+from django.db import migrations, models
+
+WIKI_MODELS = [
+    'wikibrewery', 'wikiculturalmonument', 'wikifishsculpture', 'wikifountain',
+    'wikinaturalmonument', 'wikinaturalreserve', 'wikiritterstein',
+    'wikisacralbuilding', 'wikistolperstein',
+]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lautrer_wissen', '0009_materializedtopology'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name=model_name,
+            index=models.Index(fields=['virtual_id', 'insert_timestamp'], name=f'{model_name}_vid_idx'),
+        )
+        for model_name in WIKI_MODELS
+    ]
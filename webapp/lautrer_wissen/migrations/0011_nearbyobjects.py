@@ -0,0 +1,26 @@
+# Generated by Django 5.1.15 on 2026-10-18 16:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lautrer_wissen', '0010_wiki_virtual_id'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NearbyObjects',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source_model', models.CharField(max_length=100)),
+                ('source_id', models.CharField(max_length=255)),
+                ('neighbours', models.JSONField()),
+                ('insert_timestamp', models.DateTimeField(null=True)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('source_model', 'source_id'), name='nearby_objects_source_uniq')],
+            },
+        ),
+    ]
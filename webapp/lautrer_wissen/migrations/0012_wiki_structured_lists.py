@@ -0,0 +1,65 @@
+# Generated by Django 5.1.15 on 2026-10-18 17:00
+
+import re
+
+from django.db import migrations, models
+
+WIKI_MODELS = [
+    'wikibrewery', 'wikiculturalmonument', 'wikifishsculpture', 'wikifountain',
+    'wikinaturalmonument', 'wikinaturalreserve', 'wikiritterstein',
+    'wikisacralbuilding', 'wikistolperstein',
+]
+
+
+def _split(value):
+    return str(value).split(";")[:-1] if value else []
+
+
+def split_list_fields(apps, schema_editor):
+    """Fill the JSON columns of rows imported before they existed."""
+    for model_name in WIKI_MODELS:
+        model = apps.get_model('lautrer_wissen', model_name)
+        objs = list(model.objects.all())
+        for obj in objs:
+            obj.references = [
+                {"ref": ref, "link": link}
+                for ref, link in zip(_split(obj.reference_names), _split(obj.reference_links))
+            ]
+            obj.image_additional_info = []
+            if obj.image_additional_urls:
+                obj.image_additional_info = [
+                    {"url": re.sub(r"/(\d+)px", "/500px", url), "author_name": an, "license_url": lu, "license_text": lt}
+                    for url, an, lu, lt in zip(
+                        _split(obj.image_additional_urls),
+                        _split(obj.image_additional_author_names),
+                        _split(obj.image_additional_license_urls),
+                        _split(obj.image_additional_license_texts),
+                    )
+                ]
+        model.objects.bulk_update(objs, ['references', 'image_additional_info'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lautrer_wissen', '0011_nearbyobjects'),
+    ]
+
+    operations = [
+        operation
+        for model_name in WIKI_MODELS
+        for operation in (
+            migrations.AddField(
+                model_name=model_name,
+                name='references',
+                field=models.JSONField(default=list),
+            ),
+            migrations.AddField(
+                model_name=model_name,
+                name='image_additional_info',
+                field=models.JSONField(default=list),
+            ),
+        )
+    ] + [
+        migrations.RunPython(split_list_fields, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 5.1.15 on 2026-10-18 18:00
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+WIKI_MODELS = [
+    'wikibrewery', 'wikiculturalmonument', 'wikifishsculpture', 'wikifountain',
+    'wikinaturalmonument', 'wikinaturalreserve', 'wikiritterstein',
+    'wikisacralbuilding', 'wikistolperstein',
+]
+
+NAMES_WITH_ADDRESS = [
+    'Wohnhaus', 'Wohnhäuser', 'Gasthaus', 'Wohn- und Geschäftshaus',
+    'Wohn- und Geschäftshäuser', 'Villa', 'Stadtbefestigung', 'Kriegerdenkmal',
+]
+
+
+def fill_display_names(apps, schema_editor):
+    """Set the display name of rows imported before the column existed."""
+    for model_name in WIKI_MODELS:
+        model = apps.get_model('lautrer_wissen', model_name)
+        if 'address' not in {field.name for field in model._meta.fields}:
+            model.objects.update(display_name=models.F('name'))
+            continue
+        model.objects.update(display_name=models.Case(
+            models.When(
+                name__in=NAMES_WITH_ADDRESS,
+                then=django.db.models.functions.text.Concat(
+                    models.F('name'), models.Value(' ('), models.F('address'), models.Value(')'),
+                    output_field=models.TextField(),
+                ),
+            ),
+            default=models.F('name'),
+            output_field=models.TextField(),
+        ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lautrer_wissen', '0012_wiki_structured_lists'),
+    ]
+
+    operations = [
+        operation
+        for model_name in WIKI_MODELS
+        for operation in (
+            migrations.AddField(
+                model_name=model_name,
+                name='display_name',
+                field=models.TextField(default=''),
+            ),
+            migrations.AddField(
+                model_name=model_name,
+                name='display_subtitle',
+                field=models.GeneratedField(db_persist=True, expression=models.Case(models.When(city_district_name='', then=models.Value('Kaiserslautern Umkreis')), default=models.F('city_district_name')), output_field=models.TextField()),
+            ),
+            migrations.AddIndex(
+                model_name=model_name,
+                index=models.Index(models.OrderBy(django.db.models.functions.text.Length('image_url'), descending=True), models.F('name'), name=f'{model_name}_list_idx'),
+            ),
+        )
+    ] + [
+        migrations.RunPython(fill_display_names, migrations.RunPython.noop),
+    ]
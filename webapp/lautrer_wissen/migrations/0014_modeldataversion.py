@@ -0,0 +1,22 @@
+# Generated by Django 5.1.15 on 2026-10-18 19:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lautrer_wissen', '0013_wiki_display_columns'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ModelDataVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model_name', models.CharField(max_length=100, unique=True)),
+                ('version', models.PositiveBigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(null=True)),
+            ],
+        ),
+    ]
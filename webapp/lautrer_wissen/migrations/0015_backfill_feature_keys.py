@@ -0,0 +1,33 @@
+# Generated by Django 5.1.15 on 2026-10-18 20:00
+
+from django.apps import apps as global_apps
+from django.db import migrations
+
+from lautrer_wissen.changelog import assign_missing_feature_keys
+
+
+def backfill_feature_keys(apps, schema_editor):
+    """Assign keys to rows imported before feature keys existed."""
+    for model in apps.get_app_config('lautrer_wissen').get_models():
+        field_names = {field.name for field in model._meta.concrete_fields}
+        if 'feature_key' not in field_names or 'insert_timestamp' not in field_names:
+            continue
+        if not model.objects.filter(feature_key__isnull=True).exists():
+            continue
+        # Key and LOD fields are declared on the model classes
+        current_model = global_apps.get_model('lautrer_wissen', model.__name__)
+        for attribute in ('FEATURE_KEY_FIELDS', 'LOD_LEVELS'):
+            if hasattr(current_model, attribute):
+                setattr(model, attribute, getattr(current_model, attribute))
+        assign_missing_feature_keys(model)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lautrer_wissen', '0014_modeldataversion'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_feature_keys, migrations.RunPython.noop),
+    ]
@@ -22,6 +22,8 @@ from .geo.wikipedia import *
 from .events.events import *
 from .elections.election_results import *
 from .demographics.demographic_data import *
+from .materialized import MaterializedTopology, MergedGeoFeature, NearbyObjects
+from .changelog import FeatureChange, ImportRun, ModelDataVersion
 
 from .geo import osm, wikipedia, kl, infrastructure
 from .base_model import GenericGeoModel
@@ -15,7 +15,10 @@
 #
 # Authors: Benjamin Bischke
 
+import uuid
+
 from django.contrib.gis.db import models
+from django.contrib.postgres.search import SearchVector, SearchVectorField
 
 
 class BaseModel(models.Model):
@@ -24,10 +27,19 @@ class BaseModel(models.Model):
     data_acquisition_date = models.DateField(null=True)
     city_district_name = models.CharField(max_length=255, default="", null=True)
     insert_timestamp = models.DateTimeField(null=True)
+    # Identity of the feature that is stable across imports, see lautrer_wissen.changelog
+    feature_key = models.CharField(max_length=64, null=True, blank=True, db_index=True)
 
     class Meta:
         abstract = True  # This ensures Django does NOT create a separate table
 
+    def save(self, *args, **kwargs):
+        # Objects created outside of imports (admin) get a random stable key,
+        # imports assign keys derived from the key fields
+        if not self.feature_key:
+            self.feature_key = uuid.uuid4().hex
+        super().save(*args, **kwargs)
+
     MAP_FIELDS = {
         "data_source": "Datenquelle",
         "city_district_name": "Stadtteil",
@@ -45,3 +57,56 @@ class GenericGeoModel(BaseModel):
         "name": "Name",
         "type": "model_type",
     }
+
+
+class LODGeometryMixin(models.Model):
+    """
+    Simplified copies of `geometry` (levels of detail) for overview zoom levels.
+    Filled at import with ST_SimplifyPreserveTopology, see LOD_LEVELS.
+    """
+
+    # (field name, simplification tolerance in metres, max. zoom level served)
+    LOD_LEVELS = [
+        ("geometry_lod3", 50.0, 10),
+        ("geometry_lod2", 10.0, 13),
+        ("geometry_lod1", 2.0, 15),
+    ]
+
+    geometry_lod1 = models.GeometryField(null=True, blank=True)
+    geometry_lod2 = models.GeometryField(null=True, blank=True)
+    geometry_lod3 = models.GeometryField(null=True, blank=True)
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        # Outdated after manual edits, the full geometry is served until the next import
+        for field_name, _, _ in self.LOD_LEVELS:
+            setattr(self, field_name, None)
+        super().save(*args, **kwargs)
+
+    @classmethod
+    def get_lod_field(cls, zoom=None, tolerance=None):
+        """
+        Return the name of the coarsest LOD field suitable for the given zoom
+        level or maximum tolerance (metres), or None for full resolution.
+        """
+        for field_name, lod_tolerance, max_zoom in cls.LOD_LEVELS:
+            if tolerance is not None and lod_tolerance <= tolerance:
+                return field_name
+            if tolerance is None and zoom is not None and zoom <= max_zoom:
+                return field_name
+        return None
+
+
+def search_vector_field(*field_names):
+    """
+    Stored `tsvector` (German stemming) of the given text fields, generated by
+    PostgreSQL. Models declaring it in SEARCH_VECTOR_FIELDS are searched with
+    `FullTextSearchFilter`, index it with a GinIndex.
+    """
+    return models.GeneratedField(
+        expression=SearchVector(*field_names, config="german"),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
@@ -0,0 +1,62 @@
+# Copyright (c) 2025 Vision Impulse GmbH
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# Authors: Benjamin Bischke
+
+from django.db import models
+
+
+class ImportRun(models.Model):
+    """
+    One import of a data source into `model_name`. The features it inserted,
+    updated and deleted are listed as FeatureChange rows.
+    """
+    ADMIN_HIDDEN = True
+
+    model_name = models.CharField(max_length=100, db_index=True)
+    data_source = models.CharField(max_length=255, null=True)
+    insert_timestamp = models.DateTimeField()
+    inserted_count = models.IntegerField(default=0)
+    updated_count = models.IntegerField(default=0)
+    deleted_count = models.IntegerField(default=0)
+    # Set once the changes are removed after GEO_CHANGELOG_RETENTION_RUNS newer imports
+    changes_pruned = models.BooleanField(default=False)
+
+
+class FeatureChange(models.Model):
+    """A feature (by its stable `feature_key`) changed by an import run."""
+    ADMIN_HIDDEN = True
+
+    INSERTED = "inserted"
+    UPDATED = "updated"
+    DELETED = "deleted"
+    ACTION_CHOICES = [(INSERTED, "Inserted"), (UPDATED, "Updated"), (DELETED, "Deleted")]
+
+    run = models.ForeignKey(ImportRun, related_name="changes", on_delete=models.CASCADE)
+    feature_key = models.CharField(max_length=64)
+    action = models.CharField(max_length=10, choices=ACTION_CHOICES)
+
+
+class ModelDataVersion(models.Model):
+    """
+    Counter per model bumped with every change of its data, including admin
+    edits that leave the import timestamps and row counts unchanged.
+    Part of the ETags and cache keys of the API.
+    """
+    ADMIN_HIDDEN = True
+
+    model_name = models.CharField(max_length=100, unique=True)
+    version = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(null=True)
@@ -16,10 +16,15 @@
 # Authors: Benjamin Bischke
 
 from django.contrib.gis.db import models
-from ..base_model import BaseModel
+from django.contrib.postgres.indexes import GinIndex
+from ..base_model import BaseModel, search_vector_field
 
 
 class KLCouncilEvent(BaseModel):
+    # Full-text and fuzzy search via FullTextSearchFilter
+    SEARCH_VECTOR_FIELDS = ["title", "committee"]
+    SEARCH_TRIGRAM_FIELDS = ["title"]
+
     committee = models.CharField(max_length=255)
     date = models.DateField()
     time = models.CharField(max_length=20) 
@@ -27,9 +32,20 @@ class KLCouncilEvent(BaseModel):
     category = models.CharField(max_length=100)
     title = models.TextField()
     link = models.URLField(blank=True)
+    search_vector = search_vector_field(*SEARCH_VECTOR_FIELDS)
+
+    class Meta:
+        indexes = [
+            GinIndex(fields=["search_vector"], name="klcouncilevent_search_gin"),
+            GinIndex(fields=["title"], name="klcouncilevent_title_trgm", opclasses=["gin_trgm_ops"]),
+        ]
 
 
 class KLLeisureEvent(BaseModel):
+    # Full-text and fuzzy search via FullTextSearchFilter
+    SEARCH_VECTOR_FIELDS = ["caption", "caption_addition", "description"]
+    SEARCH_TRIGRAM_FIELDS = ["caption"]
+
     id = models.AutoField(primary_key=True)
     event_id = models.TextField()
     type = models.IntegerField()
@@ -55,9 +71,20 @@ class KLLeisureEvent(BaseModel):
     dend = models.DateTimeField()
     created = models.DateTimeField()
     updated = models.DateTimeField()
+    search_vector = search_vector_field(*SEARCH_VECTOR_FIELDS)
+
+    class Meta:
+        indexes = [
+            GinIndex(fields=["search_vector"], name="klleisureevent_search_gin"),
+            GinIndex(fields=["caption"], name="klleisureevent_caption_trgm", opclasses=["gin_trgm_ops"]),
+        ]
 
 
 class WGAEvent(BaseModel):
+    # Full-text and fuzzy search via FullTextSearchFilter
+    SEARCH_VECTOR_FIELDS = ["title", "subtitle", "description"]
+    SEARCH_TRIGRAM_FIELDS = ["title"]
+
     id = models.AutoField(primary_key=True)
     event_id = models.TextField(primary_key=False)  # Corresponds to 'id'
     title = models.TextField(max_length=255, null=True, blank=True)  # 'titel'
@@ -82,3 +109,10 @@ class WGAEvent(BaseModel):
     youtube_video = models.CharField(max_length=255, null=True, blank=True)  # 'youtube'
     group_id = models.TextField(null=True, blank=True)  # 'groupid'
     date_iso = models.TextField(null=True, blank=True)  # 'datum_iso'
+    search_vector = search_vector_field(*SEARCH_VECTOR_FIELDS)
+
+    class Meta:
+        indexes = [
+            GinIndex(fields=["search_vector"], name="wgaevent_search_gin"),
+            GinIndex(fields=["title"], name="wgaevent_title_trgm", opclasses=["gin_trgm_ops"]),
+        ]
@@ -16,12 +16,14 @@
 # Authors: Benjamin Bischke
 
 from django.contrib.gis.db import models
-from ..base_model import BaseModel
+from ..base_model import BaseModel, LODGeometryMixin
 from ..mixins import FrontendURLMixin
 
 
-class KLCityDistrict(BaseModel):
+class KLCityDistrict(BaseModel, LODGeometryMixin):
     VISIBLE_OBJECT_NAME = "Stadtteil"
+    # Coordinates are stored in EPSG:25832 (metres), see assign_city_districts
+    STORED_GEOMETRY_SRID = 25832
     MAP_FIELDS = {
         "name": "Name",
         "official_district_id": "OffizielleID",
@@ -33,7 +35,7 @@ class KLCityDistrict(BaseModel):
     geometry = models.PolygonField()
 
 
-class KLParkingZone(BaseModel):
+class KLParkingZone(BaseModel, LODGeometryMixin):
     VISIBLE_OBJECT_NAME = "Parkzone"
     MAP_FIELDS = {
         "zone": "Zone",
@@ -128,7 +130,7 @@ class KLConstructionSite(BaseModel):
     geometry = models.PointField()
 
 
-class KLLandUsePlan(BaseModel):
+class KLLandUsePlan(BaseModel, LODGeometryMixin):
     VISIBLE_OBJECT_NAME = "Baurecht"
     MAP_FIELDS = {
         "baunvo": "Baunvo",
@@ -16,7 +16,7 @@
 # Authors: Benjamin Bischke
 
 from django.contrib.gis.db import models
-from ..base_model import BaseModel
+from ..base_model import BaseModel, LODGeometryMixin
 
 
 class OsmBaseLocation(BaseModel):
@@ -55,7 +55,7 @@ class OSMAmenityBench(OsmBaseLocation):
     MAP_FIELDS = BaseModel.MAP_FIELDS
 
 
-class OsmCemetery(OsmBaseLocationNamed):
+class OsmCemetery(OsmBaseLocationNamed, LODGeometryMixin):
     VISIBLE_OBJECT_NAME = "Friedhof"
     MAP_FIELDS = BaseModel.MAP_FIELDS
 
@@ -400,7 +400,7 @@ class OsmLeisureDance(BaseModel):
     geometry = models.GeometryField(null=True, blank=True)
 
 
-class OsmNatureReserve(BaseModel):
+class OsmNatureReserve(BaseModel, LODGeometryMixin):
     VISIBLE_OBJECT_NAME = "Naturschutzgebiet"
     MAP_FIELDS = {
         "name": "Name",
@@ -15,11 +15,10 @@
 #
 # Authors: Benjamin Bischke
 
+from django.conf import settings
 from django.contrib.gis.db import models
-from django.contrib.gis.db.models.functions import Distance
 from django.db.models.functions import Length
-from django.db.models import F, Value, CharField
-from django.db.models.functions import Concat
+from django.db.models import F, Value
 from django.db.models import Case, When
 from ..base_model import BaseModel
 from ..mixins import FrontendURLMixin
@@ -28,11 +27,44 @@ import re
 import hashlib
 
 
+# ';'-joined fields of the Wikipedia import split into the JSON columns
+LIST_SOURCE_FIELDS = (
+    "reference_names",
+    "reference_links",
+    "image_additional_urls",
+    "image_additional_author_names",
+    "image_additional_license_urls",
+    "image_additional_license_texts",
+)
+
+
+# Generic names shown together with the address of the object
+NAMES_WITH_ADDRESS = [
+    "Wohnhaus",
+    "Wohnhäuser",
+    "Gasthaus",
+    "Wohn- und Geschäftshaus",
+    "Wohn- und Geschäftshäuser",
+    "Villa",
+    "Stadtbefestigung",
+    "Kriegerdenkmal",
+]
+
+# Shown instead of the city district for objects outside of the city
+OUTSIDE_CITY_SUBTITLE = "Kaiserslautern Umkreis"
+
+
 class WikiModel(BaseModel, FrontendURLMixin):
 
     class Meta:
         abstract = True  # This makes it an abstract base class in Django
-
+        indexes = [
+            # Detail lookups by the public id, the newest row wins. Objects
+            # sharing a location (e.g. Stolpersteine) share it, so it is not unique.
+            models.Index(fields=["virtual_id", "insert_timestamp"], name="%(class)s_vid_idx"),
+            # Order of the list view, objects with images first
+            models.Index(Length("image_url").desc(), F("name"), name="%(class)s_list_idx"),
+        ]
 
     MAP_FIELDS = {
         "name": "Name",
@@ -51,91 +83,117 @@ class WikiModel(BaseModel, FrontendURLMixin):
     image_additional_author_names = models.TextField(default="")
     image_additional_license_urls = models.TextField(default="")
     image_additional_license_texts = models.TextField(default="")
+    # Lists of the ';'-joined fields above, split once when saved or imported
+    references = models.JSONField(default=list)
+    image_additional_info = models.JSONField(default=list)
+    # Shown in the list view, set when saved or imported (see `display_name_for`)
+    display_name = models.TextField(default="")
+    # The city district is assigned by the import or afterwards in PostGIS
+    display_subtitle = models.GeneratedField(
+        expression=Case(
+            When(city_district_name="", then=Value(OUTSIDE_CITY_SUBTITLE)),
+            default=F("city_district_name"),
+        ),
+        output_field=models.TextField(),
+        db_persist=True,
+    )
 
 
     @classmethod
-    def _db_case_modify_name(cls):
+    def display_name_for(cls, values):
         """
-        Dynamically build a CASE expression for name/address formatting,
-        safely skipping missing fields.
+        Name of the object in lists, generic names (see NAMES_WITH_ADDRESS)
+        are followed by the address. `values` is a row of the import.
         """
-        # Check which fields exist on this model
-        has_name = "name" in [f.name for f in cls._meta.get_fields()]
+        name = values.get("name") or ""
         has_address = "address" in [f.name for f in cls._meta.get_fields()]
-
-        # Define base field for default fallback
-        base_field = F("name") if has_name else Value("")
-
-        if has_name and has_address:
-            return Case(
-                When(
-                    name__in=[
-                        "Wohnhaus",
-                        "Wohnhäuser",
-                        "Gasthaus",
-                        "Wohn- und Geschäftshaus",
-                        "Wohn- und Geschäftshäuser",
-                        "Villa",
-                        "Stadtbefestigung",
-                        "Kriegerdenkmal",
-                    ],
-                    then=Concat(
-                        F("name"),
-                        Value(" ("),
-                        F("address"),
-                        Value(")"),
-                        output_field=CharField(),
-                    ),
-                ),
-                default=base_field,
-                output_field=CharField(),
-            )
-
-        # Only 'name' exists
-        elif has_name:
-            return F("name")
-
-        # No name/address → just empty string
-        else:
-            return Value("")
+        if has_address and name in NAMES_WITH_ADDRESS:
+            return f"{name} ({values.get('address') or ''})"
+        return name
 
     @classmethod
     def objects_for_list_view(cls):
-        DB_CASE_MODIFY_NAME = cls._db_case_modify_name()
-        objs = (
-            cls.objects.annotate(has_image=Length("image_url"))
-            .annotate(combined_name=DB_CASE_MODIFY_NAME)
-            .order_by("-has_image", "name")
+        """Values shown in the list view, read without model instances."""
+        return cls.objects.order_by(Length("image_url").desc(), "name").values(
+            "virtual_id",
+            "geometry",
+            "image_url",
+            "image_license_url",
+            "image_license_text",
+            "image_author_name",
+            "display_name",
+            "display_subtitle",
         )
-        return objs
 
     @classmethod
     def nearby_objects_as_dict(cls, curr_obj, top_n=5):
+        from ...nearby import read_nearby_objects, store_nearby_objects
+
+        # Precomputed after each import, computed and stored on first use after admin edits
+        neighbours = read_nearby_objects(cls, curr_obj.virtual_id)
+        if top_n > settings.GEO_NEARBY_OBJECTS_COUNT:
+            neighbours = cls.compute_nearby_objects(curr_obj, top_n)
+        elif neighbours is None:
+            neighbours = cls.compute_nearby_objects(curr_obj, settings.GEO_NEARBY_OBJECTS_COUNT)
+            store_nearby_objects(cls, curr_obj.virtual_id, neighbours)
         return [
             {
-                "distance": str(round(obj.distance.km, 3)).replace(".", ","),
-                "id": obj.virtual_id,
-                "name": getattr(obj, "combined_name", obj.name), # Try to use combined name from SQL, as fallback use name!
+                "distance": str(round(obj["distance"] / 1000, 3)).replace(".", ","),
+                "id": obj["id"],
+                "name": obj["name"],
             }
-            for obj in cls._nearby_objects_by_location(curr_obj, top_n)
+            for obj in neighbours[:top_n]
         ]
 
     @classmethod
-    def _nearby_objects_by_location(cls, curr_obj, top_n=5):
-        DB_CASE_MODIFY_NAME = cls._db_case_modify_name()
-        return (
-            cls.objects.annotate(distance=Distance("geometry", curr_obj.geometry))
-            .annotate(combined_name=DB_CASE_MODIFY_NAME)
-            .order_by("distance")[1 : top_n + 1]
-        )
-    def get_references(self):
-        return [
+    def compute_nearby_objects(cls, curr_obj, top_n=5):
+        from ...nearby import nearby_objects
+
+        return nearby_objects(curr_obj.geometry, [cls._nearby_candidates(curr_obj)], top_n)
+
+    @classmethod
+    def _nearby_candidates(cls, curr_obj):
+        """Objects that may be listed as nearby objects of `curr_obj`."""
+        return cls.objects.exclude(pk=curr_obj.pk)
+    @staticmethod
+    def structured_list_fields(values):
+        """
+        Split the ';'-joined reference and image fields of `values` (a row
+        of the Wikipedia import) into the lists stored in the JSON columns.
+        """
+        def split(name):
+            value = values.get(name)
+            return str(value).split(";")[:-1] if value else []
+
+        references = [
             {"ref": ref, "link": link}
-            for ref, link in zip(
-                self.reference_names.split(";")[:-1],
-                self.reference_links.split(";")[:-1],
-            )
+            for ref, link in zip(split("reference_names"), split("reference_links"))
         ]
+        image_additional_info = []
+        if values.get("image_additional_urls"):
+            image_additional_info = [
+                {"url": re.sub(r"/(\d+)px", "/500px", url), "author_name": an, "license_url": lu, "license_text": lt}
+                for url, an, lu, lt in zip(
+                    split("image_additional_urls"),
+                    split("image_additional_author_names"),
+                    split("image_additional_license_urls"),
+                    split("image_additional_license_texts"),
+                )
+            ]
+        return {"references": references, "image_additional_info": image_additional_info}
+
+    def save(self, *args, **kwargs):
+        # Objects loaded with deferred source fields keep their derived values
+        deferred_fields = self.get_deferred_fields()
+        if not set(LIST_SOURCE_FIELDS) & deferred_fields:
+            for name, value in self.structured_list_fields(self.__dict__).items():
+                setattr(self, name, value)
+        if not {"name", "address"} & deferred_fields:
+            self.display_name = self.display_name_for(self.__dict__)
+        super().save(*args, **kwargs)
+
+    def get_references(self):
+        return self.references
 
     def get_image_info(self):
         """Returns the image info of the object."""
@@ -150,30 +208,8 @@ class WikiModel(BaseModel, FrontendURLMixin):
             "image_license_text": self.image_license_text,
         }
 
-        if self.image_additional_urls:
-            image_additional_urls = re.sub(
-                r"/(\d+)px", "/500px", str(self.image_additional_urls)
-            )
-            image_additional_urls = image_additional_urls.split(";")[:-1]
-            image_additional_author_names = str(
-                self.image_additional_author_names
-            ).split(";")[:-1]
-            image_additional_license_urls = str(
-                self.image_additional_license_urls
-            ).split(";")[:-1]
-            image_additional_license_texts = str(
-                self.image_additional_license_texts
-            ).split(";")[:-1]
-
-            res["image_additional_info"] = [
-                {"url": url, "author_name": an, "license_url": lu, "license_text": lt}
-                for url, an, lu, lt in zip(
-                    image_additional_urls,
-                    image_additional_author_names,
-                    image_additional_license_urls,
-                    image_additional_license_texts,
-                )
-            ]
+        if self.image_additional_info:
+            res["image_additional_info"] = self.image_additional_info
         return res
 
 
@@ -183,14 +219,34 @@ class WikiFormatMixin(models.Model):
     class Meta:
         abstract = True
 
+    # Formatting applied to the field values, per field name
+    FIELD_FORMATTERS = {
+        "address": lambda value: value if value else "Unbekannt",
+        "description": lambda value: str(value).replace(" .", "."),
+    }
+
     def __getattribute__(self, name):
-        if name == "address":
-            value = super().__getattribute__(name)
-            return value if value else "Unbekannt"
-        if name == "description":
-            value = super().__getattribute__(name)
-            return str(value).replace(" .", ".")
-        return super().__getattribute__(name)
+        value = super().__getattribute__(name)
+        formatter = type(self).FIELD_FORMATTERS.get(name)
+        return formatter(value) if formatter else value
+
+    @staticmethod
+    def formatted_field_values(obj, field_names):
+        """
+        Fast path for bulk serialization: the formatted values of `field_names`
+        read from the instance dict, instead of passing every attribute access
+        through `__getattribute__`. Deferred fields are loaded as usual.
+        """
+        values = object.__getattribute__(obj, "__dict__")
+        formatters = type(obj).FIELD_FORMATTERS
+        result = {}
+        for name in field_names:
+            if name not in values:
+                result[name] = getattr(obj, name, None)
+                continue
+            formatter = formatters.get(name)
+            result[name] = formatter(values[name]) if formatter else values[name]
+        return result
 
 
 class WikiFishSculpture(WikiModel, WikiFormatMixin):
@@ -209,14 +265,10 @@ class WikiFishSculpture(WikiModel, WikiFormatMixin):
     number = models.IntegerField()
     address = models.TextField(blank=True, null=True)
 
-    def __getattribute__(self, name):
-        if name == "number":
-            value = object.__getattribute__(self, name)
-            return value if value != -1 else ""
-        if name == "designed_by":
-            value = super().__getattribute__(name)
-            return value if value else "Unbekannt"
-        return object.__getattribute__(self, name)
+    FIELD_FORMATTERS = {
+        "number": lambda value: value if value != -1 else "",
+        "designed_by": lambda value: value if value else "Unbekannt",
+    }
 
     def get_references(self):
         return []  # No references for fish sculptures
@@ -419,14 +471,9 @@ class WikiStolperstein(WikiModel):
         return res
     
     @classmethod
-    def _nearby_objects_by_location(cls, curr_obj, top_n=5):
-        DB_CASE_MODIFY_NAME = cls._db_case_modify_name()
-        return (
-            cls.objects.annotate(distance=Distance("geometry", curr_obj.geometry))
-            .annotate(combined_name=DB_CASE_MODIFY_NAME)
-            .filter(distance__gt=0)
-            .order_by("distance")[1 : top_n + 1]
-        )
+    def _nearby_candidates(cls, curr_obj):
+        """Stolpersteine at the same location are part of `curr_obj` itself."""
+        return cls.objects.exclude(geometry=curr_obj.geometry)
     
 
 MODEL_CLASSES = [
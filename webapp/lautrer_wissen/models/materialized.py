@@ -0,0 +1,64 @@
+# Copyright (c) 2025 Vision Impulse GmbH
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# Authors: Benjamin Bischke
+
+from django.contrib.gis.db import models
+
+
+class MergedGeoFeature(models.Model):
+    """
+    GeoJSON feature of a layer whose objects are grouped by coordinates
+    (see MERGED_FEATURE_MODELS), with the merged property arrays.
+    Rebuilt after each import of the source model.
+    """
+    ADMIN_HIDDEN = True
+
+    model_name = models.CharField(max_length=100, db_index=True)
+    geometry = models.GeometryField(null=True, blank=True)
+    feature = models.JSONField()
+    insert_timestamp = models.DateTimeField(null=True)
+
+
+class MaterializedTopology(models.Model):
+    """
+    TopoJSON of a polygon layer whose features share boundaries (see
+    TOPOLOGY_MODELS), with each shared arc stored once, quantized and delta
+    encoded. Rebuilt after each import of the source model.
+    """
+    ADMIN_HIDDEN = True
+
+    model_name = models.CharField(max_length=100, unique=True)
+    content = models.TextField()
+    insert_timestamp = models.DateTimeField(null=True)
+
+
+class NearbyObjects(models.Model):
+    """
+    Nearest objects of an object with a detail page (see
+    MODELS_WITH_DETAIL_PAGE), ordered by distance in metres.
+    Rebuilt after each import of the source model.
+    """
+    ADMIN_HIDDEN = True
+
+    source_model = models.CharField(max_length=100)
+    source_id = models.CharField(max_length=255)
+    neighbours = models.JSONField()
+    insert_timestamp = models.DateTimeField(null=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["source_model", "source_id"], name="nearby_objects_source_uniq"),
+        ]
@@ -0,0 +1,211 @@
+# Copyright (c) 2025 Vision Impulse GmbH
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# Authors: Benjamin Bischke
+
+import logging
+
+from django.conf import settings
+from django.contrib.gis.geos import Point
+from django.db import connection, transaction
+from django.db.models import CharField, F, Value
+from django.utils.timezone import now
+from rest_framework.exceptions import ValidationError
+
+from .geo_sql import API_SRID, geometry_expression, id_expression
+from .models import MODELS_WITH_DETAIL_PAGE, NearbyObjects
+
+logger = logging.getLogger("webapp")
+
+# Lower bounds of the length of a degree of latitude and of longitude at the
+# equator in metres on the WGS84 ellipsoid, used to enclose a search radius
+# in a bounding box served by the geometry index. The boxes do not wrap
+# around the poles or the antimeridian, all layers lie in Kaiserslautern.
+METRES_PER_DEGREE_LAT = 110000
+METRES_PER_DEGREE_LON = 111000
+
+ORIGIN_SQL = f"ST_SetSRID(ST_MakePoint(%s, %s), {API_SRID})"
+
+
+def name_expression(model):
+    """Expression for the display name of nearby objects of `model`."""
+    field_names = {field.name for field in model._meta.fields}
+    if "display_name" in field_names:
+        return F("display_name")
+    if "name" in field_names:
+        return F("name")
+    return Value("", output_field=CharField())
+
+
+def has_indexed_geometry(model):
+    """
+    True if `model` stores its location in an indexed `geometry` column.
+    Coordinates stored in another SRID (KLCityDistrict) are transformed by
+    `geometry_expression` and searched without the index.
+    """
+    return any(field.name == "geometry" for field in model._meta.concrete_fields)
+
+
+def _nearby_branch(queryset, origin, limit):
+    """
+    SQL and params selecting the `limit` objects of `queryset` closest to
+    `origin` by their distance on the spheroid. The `limit` nearest objects
+    by the planar KNN operator on the geometry index bound the search
+    radius: at least `limit` objects lie within their largest geodesic
+    distance, so the result is exact while only the objects within that
+    radius (found by a bounding box on the index) are ranked.
+    """
+    model = queryset.model
+    if not has_indexed_geometry(model):
+        raise ValidationError({"detail": f"{model.__name__} has no geometry."})
+    geometry = geometry_expression(model)
+
+    location_fields = {"geometry", "virtual_id"}
+    queryset = queryset.only(
+        model._meta.pk.name,
+        *(field.name for field in model._meta.concrete_fields if field.name in location_fields),
+    ).annotate(nearby_name=name_expression(model))
+
+    inner_sql, inner_params = queryset.query.sql_with_params()
+    distance = f"ST_Distance({geometry}::geography, {ORIGIN_SQL}::geography)"
+    sql = f"""
+        (SELECT
+            %s AS model,
+            {id_expression(model)}::text AS id,
+            t.nearby_name::text AS name,
+            {distance} AS distance
+        FROM ({inner_sql}) AS t, (
+            SELECT max({distance}) AS metres
+            FROM (
+                SELECT t.* FROM ({inner_sql}) AS t
+                WHERE {geometry} IS NOT NULL
+                ORDER BY {geometry} <-> {ORIGIN_SQL}
+                LIMIT %s
+            ) AS t
+        ) AS radius
+        WHERE {geometry} && ST_Expand(
+            {ORIGIN_SQL},
+            radius.metres / ({METRES_PER_DEGREE_LON}
+                * cos(radians(least(abs(%s) + radius.metres / {METRES_PER_DEGREE_LAT}, 89.9)))),
+            radius.metres / {METRES_PER_DEGREE_LAT}
+        )
+        AND ST_DWithin({geometry}::geography, {ORIGIN_SQL}::geography, radius.metres)
+        ORDER BY distance
+        LIMIT %s)
+    """
+    params = [
+        model.__name__.lower(),
+        origin.x, origin.y,
+        *inner_params,
+        origin.x, origin.y,
+        *inner_params,
+        origin.x, origin.y,
+        limit,
+        origin.x, origin.y,
+        origin.y,
+        origin.x, origin.y,
+        limit,
+    ]
+    return sql, params
+
+
+def nearby_objects(origin, querysets, limit=5):
+    """
+    Return the `limit` objects of `querysets` closest to the point `origin`
+    (EPSG:4326) as dicts with model, id, name and distance in metres. Several
+    querysets (e.g. of different layers) are combined in one UNION query.
+    """
+    if not isinstance(origin, Point):
+        origin = Point(*origin, srid=API_SRID)
+
+    branches = [_nearby_branch(queryset, origin, limit) for queryset in querysets]
+    if not branches:
+        return []
+
+    sql = f"""
+        SELECT model, id, name, distance
+        FROM ({" UNION ALL ".join(branch_sql for branch_sql, _ in branches)}) AS nearby
+        ORDER BY distance
+        LIMIT %s
+    """
+    params = [param for _, branch_params in branches for param in branch_params]
+    params.append(limit)
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [
+            {"model": model, "id": object_id, "name": name, "distance": distance}
+            for model, object_id, name, distance in cursor.fetchall()
+        ]
+
+
+def refresh_nearby_objects(model):
+    """
+    Compute and store the nearest objects of every object of `model`, so
+    detail pages read them with one indexed lookup instead of a spatial
+    query. Runs after imports, see `refresh_derived_data`.
+    """
+    if model not in MODELS_WITH_DETAIL_PAGE:
+        return 0
+
+    timestamp = now()
+    rows = [
+        NearbyObjects(
+            source_model=model.__name__,
+            source_id=obj.virtual_id,
+            neighbours=model.compute_nearby_objects(obj, settings.GEO_NEARBY_OBJECTS_COUNT),
+            insert_timestamp=timestamp,
+        )
+        # During an import the previous rows may still exist, the newest win
+        for obj in {
+            obj.virtual_id: obj
+            for obj in model.objects.only("pk", "virtual_id", "geometry").order_by("insert_timestamp")
+        }.values()
+    ]
+    with transaction.atomic():
+        NearbyObjects.objects.filter(source_model=model.__name__).delete()
+        # Rows stored concurrently by `store_nearby_objects` are just as recent
+        NearbyObjects.objects.bulk_create(rows, batch_size=1000, ignore_conflicts=True)
+    logger.info("Stored nearby objects for %s (%s objects)", model.__name__, len(rows))
+    return len(rows)
+
+
+def read_nearby_objects(model, source_id):
+    """Return the stored nearest objects of an object or None if not computed yet."""
+    return (
+        NearbyObjects.objects.filter(source_model=model.__name__, source_id=source_id)
+        .values_list("neighbours", flat=True)
+        .first()
+    )
+
+
+def store_nearby_objects(model, source_id, neighbours):
+    """Store the nearest objects of an object computed on demand, e.g. after admin edits."""
+    NearbyObjects.objects.bulk_create(
+        [
+            NearbyObjects(
+                source_model=model.__name__,
+                source_id=source_id,
+                neighbours=neighbours,
+                insert_timestamp=now(),
+            )
+        ],
+        ignore_conflicts=True,
+    )
+
+
+def invalidate_nearby_objects(model):
+    """Drop the stored nearest objects of all objects of `model`."""
+    NearbyObjects.objects.filter(source_model=model.__name__).delete()
@@ -0,0 +1,57 @@
+# Copyright (c) 2025 Vision Impulse GmbH
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# Authors: Benjamin Bischke
+
+import logging
+
+from .merged_features import invalidate_merged_features, refresh_merged_features
+from .nearby import invalidate_nearby_objects, refresh_nearby_objects
+from .snapshots import invalidate_geo_snapshot, refresh_geo_snapshot
+from .topology import invalidate_topology, refresh_topology
+
+logger = logging.getLogger("webapp")
+
+
+def refresh_derived_data(model):
+    """
+    Rebuild the data derived from the layer of `model` after an import: the
+    merged features, the stored TopoJSON, the nearest objects of detail
+    pages and the GeoJSON snapshot, which may be built from the merged
+    features.
+    """
+    refreshes = [
+        ("merged features", refresh_merged_features),
+        ("TopoJSON", refresh_topology),
+        ("nearby objects", refresh_nearby_objects),
+    ]
+    for name, refresh in refreshes:
+        try:
+            refresh(model)
+        except Exception:
+            logger.exception("Could not refresh %s for %s", name, model.__name__)
+
+    refresh_geo_snapshot(model)
+
+
+def invalidate_derived_data(model):
+    """
+    Drop the data derived from the layer of `model` after admin edits, it is
+    rebuilt on the next request that needs it instead of during the edit.
+    """
+    invalidate_merged_features(model)
+    invalidate_topology(model)
+    invalidate_nearby_objects(model)
+    invalidate_geo_snapshot(model)
@@ -16,11 +16,30 @@
 # Authors: Benjamin Bischke
 
 from rest_framework import serializers
+from frontend_config.utils import get_model_field_mapping
+from ..filters import GEOMETRY_FIELD_NAMES, get_requested_fields, is_geometry_requested
+from ..geo_sql import is_requested_field
 
 
 def create_generic_serializer(model):
     """Dynamically creates and returns a serializer class for the given model."""
     class DynamicSerializer(serializers.ModelSerializer):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+
+            # Sparse fieldsets via ?fields=a,b,c and ?geometry=false
+            request = self.context.get("request")
+            requested_fields = get_requested_fields(request)
+            if requested_fields is not None:
+                fields_mapping, _ = get_model_field_mapping(model)
+                for name in list(self.fields):
+                    if name == "id" or is_requested_field(name, fields_mapping.get(name), requested_fields):
+                        continue
+                    self.fields.pop(name)
+            if not is_geometry_requested(request):
+                for name in GEOMETRY_FIELD_NAMES:
+                    self.fields.pop(name, None)
+
         def to_representation(self, instance):
             """Override to remove fields with NaN values."""
             data = super().to_representation(instance)
@@ -30,7 +49,8 @@ def create_generic_serializer(model):
         @classmethod
         def get_filtered_fields(cls):
             """Dynamically get fields, excluding those that might have NaN values."""
-            return [field.name for field in model._meta.fields]  # Get all model fields
+            # All model fields except generated ones (search vectors)
+            return [field.name for field in model._meta.fields if not field.generated]
 
     # Dynamically create the Meta class and assign it to the serializer
     MetaClass = type("Meta", (), {"model": model, "fields": DynamicSerializer.get_filtered_fields()})
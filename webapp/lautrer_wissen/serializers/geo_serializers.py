@@ -18,6 +18,8 @@
 from rest_framework import serializers
 from rest_framework_gis.serializers import GeoFeatureModelSerializer
 from ..models import MODELS_WITH_DETAIL_PAGE
+from ..models.geo.wikipedia import WikiFormatMixin
+from ..geo_sql import get_coordinate_precision, is_requested_field
 
 from frontend_config.utils import get_model_field_mapping
 
@@ -32,32 +34,47 @@ class BaseGeoSerializer(GeoFeatureModelSerializer):
         Compute geometry if the model does not have a `geometry` field.
         Otherwise, use the existing geometry field.
         """
-        if hasattr(obj, "geometry") and obj.geometry:  # If model has geometry, use it
-            if obj.geometry.geom_type == "LineString":
+        if not self.context.get("include_geometry", True):
+            return None
+
+        geometry = getattr(obj, "geometry", None)
+
+        # Simplified geometry requested via ?zoom= / ?tolerance=
+        lod_field = self.context.get("lod_field")
+        if lod_field and getattr(obj, lod_field, None):
+            geometry = getattr(obj, lod_field)
+
+        precision = get_coordinate_precision(obj.__class__, self.context.get("precision"))
+
+        def coord(values):
+            return [round(value, precision) for value in values]
+
+        if geometry:  # If model has geometry, use it
+            if geometry.geom_type == "LineString":
                 return {
                     "type": "LineString",
-                    "coordinates": [list(coord) for coord in obj.geometry.coords]
+                    "coordinates": [coord(c) for c in geometry.coords]
                 }
-            if obj.geometry.geom_type == "MultiPolygon":
-                largest = max(obj.geometry, key=lambda g: g.area)
+            if geometry.geom_type == "MultiPolygon":
+                largest = max(geometry, key=lambda g: g.area)
                 return {
                     "type": "Polygon",              
-                    "coordinates": [list(coord) for coord in largest.coords[0]] 
+                    "coordinates": [coord(c) for c in largest.coords[0]] 
                 }
-            if obj.geometry.geom_type == "Polygon":
+            if geometry.geom_type == "Polygon":
                 return {
                     "type": "Polygon",
-                    "coordinates": [list(coord) for coord in obj.geometry.coords[0]]
+                    "coordinates": [coord(c) for c in geometry.coords[0]]
                 }
-            elif obj.geometry.geom_type == "Point":
+            elif geometry.geom_type == "Point":
                 return {
                     "type": "Point",
-                    "coordinates": [obj.geometry.x, obj.geometry.y]
+                    "coordinates": coord((geometry.x, geometry.y))
                 }
         elif hasattr(obj, "latitude") and hasattr(obj, "longitude"):  # Compute if missing
             return {
                 "type": "Point",
-                "coordinates": [float(obj.longitude), float(obj.latitude)]
+                "coordinates": coord((float(obj.longitude), float(obj.latitude)))
             }
         return None  # Fallback if no geometry
 
@@ -72,9 +89,19 @@ class BaseGeoSerializer(GeoFeatureModelSerializer):
         if visible_object_name != "":
             properties["Objektart"] = visible_object_name
 
-        # Rename and select only configured fields
-        for model_field, response_field in fields_mapping.items():
-            val = getattr(obj, model_field, None)
+        # Rename and select only configured (and with ?fields= requested) fields
+        requested_fields = self.context.get("fields")
+        selected_fields = {
+            model_field: response_field
+            for model_field, response_field in fields_mapping.items()
+            if is_requested_field(model_field, response_field, requested_fields)
+        }
+        if isinstance(obj, WikiFormatMixin):
+            values = WikiFormatMixin.formatted_field_values(obj, selected_fields)
+        else:
+            values = {model_field: getattr(obj, model_field, None) for model_field in selected_fields}
+        for model_field, response_field in selected_fields.items():
+            val = values[model_field]
             if val is not None and val != "":
                 properties[response_field] = val
 
@@ -16,15 +16,21 @@
 # Authors: Benjamin Bischke
 
 from abc import abstractmethod
+from functools import cache
 
 from rest_framework import serializers
 from frontend_config.utils import get_model_field_mapping
 
 
 def get_wiki_serializer_for_model(obj, model):
-    """Dynamically create a serializer class for the given model."""
+    """Return a serializer for `obj` of the given model."""
+    return get_wiki_serializer_class(model)(obj)
 
-    DynamicSerializer = type(
+
+@cache
+def get_wiki_serializer_class(model):
+    """Dynamically create a serializer class for the given model, once per model."""
+    return type(
         f"{model.__name__}Serializer",  # Dynamically set class name
         (WikiBaseObjectSerializer,),  # Inherit from base serializer
         {
@@ -35,7 +41,6 @@ def get_wiki_serializer_for_model(obj, model):
             )
         },
     )
-    return DynamicSerializer(obj)
 
 
 class WikiBaseObjectSerializer(
@@ -84,7 +89,7 @@ class WikiBaseObjectSerializer(
         return display_data
 
     def get_references(self, obj):
-        return list(obj.get_references())
+        return obj.get_references()
 
     def get_coordinate(self, obj):
         """Returns the latitude and longitude of the object."""
@@ -0,0 +1,50 @@
+# Copyright (c) 2025 Vision Impulse GmbH
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# Authors: Benjamin Bischke
+
+from django.apps import apps
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from frontend_config.model_field_config import ModelConfig, ModelFieldConfig
+from lautrer_wissen.snapshots import invalidate_geo_snapshot
+from lautrer_wissen.merged_features import invalidate_merged_features
+from lautrer_wissen.topology import invalidate_topology
+
+
+@receiver(post_save, sender=ModelConfig)
+@receiver(post_delete, sender=ModelConfig)
+def model_config_changed(sender, instance, **kwargs):
+    _invalidate_snapshot(instance)
+
+
+@receiver(post_save, sender=ModelFieldConfig)
+@receiver(post_delete, sender=ModelFieldConfig)
+def model_field_config_changed(sender, instance, **kwargs):
+    try:
+        _invalidate_snapshot(instance.model_config)
+    except ModelConfig.DoesNotExist:
+        pass
+
+
+def _invalidate_snapshot(model_config):
+    """Snapshots, merged features and topologies contain the configured field names and must be re-rendered."""
+    try:
+        model = apps.get_model(model_config.app_label, model_config.model_name)
+    except LookupError:
+        return
+    invalidate_geo_snapshot(model)
+    invalidate_merged_features(model)
+    invalidate_topology(model)
@@ -0,0 +1,153 @@
+# Copyright (c) 2025 Vision Impulse GmbH
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# Authors: Benjamin Bischke
+
+import hashlib
+import logging
+import os
+import tempfile
+
+from django.conf import settings
+from django.http import FileResponse
+
+logger = logging.getLogger("webapp")
+
+# Name of the file holding the content hash of the current snapshot
+SNAPSHOT_POINTER_FILENAME = "current"
+
+# Layers written continuously by the MQTT ingesters are always served live
+EXCLUDED_MODEL_NAMES = ["KLFieldtestMeasurements"]
+
+
+def _snapshot_dir(model):
+    return os.path.join(settings.GEO_SNAPSHOT_DIR, model._meta.model_name)
+
+
+def _atomic_write(path, content: bytes):
+    """Write `content` to `path` so that readers never see a partial file."""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def is_snapshot_model(model):
+    from .models import API_GEO_MODELS
+    return (
+        settings.GEO_SNAPSHOTS_ENABLED
+        and model in API_GEO_MODELS
+        and model.__name__ not in EXCLUDED_MODEL_NAMES
+    )
+
+
+def get_geo_snapshot_version(model):
+    """Return the content hash of the current snapshot of `model` or None."""
+    if not is_snapshot_model(model):
+        return None
+    try:
+        pointer = os.path.join(_snapshot_dir(model), SNAPSHOT_POINTER_FILENAME)
+        with open(pointer, "r") as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def store_geo_snapshot(model, content: bytes):
+    """
+    Store the rendered FeatureCollection of `model` under its content hash
+    and make it the current snapshot. Returns the content hash.
+    """
+    if not is_snapshot_model(model):
+        return None
+
+    version = hashlib.sha256(content).hexdigest()
+    snapshot_dir = _snapshot_dir(model)
+    try:
+        os.makedirs(snapshot_dir, exist_ok=True)
+        path = os.path.join(snapshot_dir, f"{version}.json")
+        if not os.path.exists(path):
+            _atomic_write(path, content)
+        _atomic_write(
+            os.path.join(snapshot_dir, SNAPSHOT_POINTER_FILENAME), version.encode()
+        )
+
+        # Remove outdated snapshots, open file handles stay valid
+        for filename in os.listdir(snapshot_dir):
+            if filename.endswith(".json") and filename != f"{version}.json":
+                os.remove(os.path.join(snapshot_dir, filename))
+    except OSError:
+        logger.exception("Could not store GeoJSON snapshot for %s", model.__name__)
+        return None
+    return version
+
+
+def invalidate_geo_snapshot(model):
+    """Drop the current snapshot of `model`, the next request re-renders it."""
+    pointer = os.path.join(_snapshot_dir(model), SNAPSHOT_POINTER_FILENAME)
+    try:
+        os.remove(pointer)
+    except FileNotFoundError:
+        pass
+
+
+def refresh_geo_snapshot(model):
+    """
+    Render the unfiltered FeatureCollection of `model` and store it as the
+    current snapshot. Called after imports, see `refresh_derived_data`.
+    """
+    if not is_snapshot_model(model):
+        return None
+
+    from .views.viewset_geo import render_feature_collection_json
+
+    try:
+        version = store_geo_snapshot(model, render_feature_collection_json(model))
+        logger.info("Refreshed GeoJSON snapshot for %s (%s)", model.__name__, version)
+        return version
+    except Exception:
+        logger.exception("Could not refresh GeoJSON snapshot for %s", model.__name__)
+        invalidate_geo_snapshot(model)
+        return None
+
+
+def read_geo_snapshot(model):
+    """Return the content of the current snapshot of `model` or None."""
+    version = get_geo_snapshot_version(model)
+    if version is None:
+        return None
+    try:
+        with open(os.path.join(_snapshot_dir(model), f"{version}.json"), "rb") as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+def geo_snapshot_response(model):
+    """Return a response serving the current snapshot of `model` or None."""
+    version = get_geo_snapshot_version(model)
+    if version is None:
+        return None
+    try:
+        snapshot_file = open(os.path.join(_snapshot_dir(model), f"{version}.json"), "rb")
+    except FileNotFoundError:
+        # Replaced by a concurrent refresh in the meantime
+        return None
+    return FileResponse(snapshot_file, content_type="application/json")
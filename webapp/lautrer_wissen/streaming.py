@@ -0,0 +1,56 @@
+# Copyright (c) 2025 Vision Impulse GmbH
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# Authors: Benjamin Bischke
+
+from itertools import islice
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+
+# Chunks produced per switch to the synchronous thread
+CHUNKS_PER_FETCH = 50
+
+
+async def iterate_in_thread(chunks, chunks_per_fetch=CHUNKS_PER_FETCH):
+    """
+    Async iterator over the synchronous iterator `chunks`. The chunks are
+    produced in the thread of the request (and its database connection),
+    a few at a time, and sent before the next ones are produced.
+    """
+    iterator = iter(chunks)
+    next_chunks = sync_to_async(lambda: list(islice(iterator, chunks_per_fetch)), thread_sensitive=True)
+    try:
+        while True:
+            fetched = await next_chunks()
+            if not fetched:
+                break
+            for chunk in fetched:
+                yield chunk
+    finally:
+        if hasattr(iterator, "close"):
+            await sync_to_async(iterator.close, thread_sensitive=True)()
+
+
+def streaming_response(request, chunks, content_type="application/json"):
+    """
+    StreamingHttpResponse sending the encoded `chunks` as they are produced.
+    Under ASGI Django collects synchronous iterators completely before the
+    first byte is sent, so they are passed as async iterator there.
+    """
+    if isinstance(getattr(request, "_request", request), ASGIRequest):
+        chunks = iterate_in_thread(chunks)
+    return StreamingHttpResponse(chunks, content_type=content_type)
@@ -15,6 +15,142 @@
 #
 # Authors: Benjamin Bischke
 
-from django.test import TestCase
+import hashlib
 
-# Create your tests here.
+from django.contrib.gis.geos import Polygon
+from django.test import SimpleTestCase
+from shapely.geometry import LineString, Point, box
+
+from .models import KLCityDistrict
+from .topology import build_topology
+
+
+class _Feature:
+    def __init__(self, pk, geometry):
+        self.pk = pk
+        self.geometry = geometry
+
+
+class _FeatureQuerySet(list):
+    def iterator(self):
+        return iter(self)
+
+
+class _FeatureSerializer:
+    def __init__(self, context=None):
+        pass
+
+    def get_id(self, obj):
+        return obj.pk
+
+    def get_properties(self, obj):
+        return {"id": obj.pk}
+
+
+def decode_topology_rings(topology):
+    """Return {id: [ring, ...]} of the polygons of a TopoJSON Topology in absolute coordinates."""
+    (kx, ky), (x0, y0) = topology["transform"]["scale"], topology["transform"]["translate"]
+    arcs = []
+    for encoded in topology["arcs"]:
+        x, y, arc = 0, 0, []
+        for dx, dy in encoded:
+            x, y = x + dx, y + dy
+            arc.append((x * kx + x0, y * ky + y0))
+        arcs.append(arc)
+
+    def ring(indices):
+        points = []
+        for index in indices:
+            arc = arcs[index] if index >= 0 else arcs[~index][::-1]
+            points.extend(arc if not points else arc[1:])
+        return points
+
+    geometries = next(iter(topology["objects"].values()))["geometries"]
+    return {geometry["id"]: [ring(indices) for indices in geometry["arcs"]] for geometry in geometries}
+
+
+def same_ring(ring, expected):
+    """True if the closed rings contain the same points in the same cyclic order."""
+    ring, expected = ring[:-1], expected[:-1]
+    if len(ring) != len(expected) or expected[0] not in ring:
+        return False
+    start = ring.index(expected[0])
+    return ring[start:] + ring[:start] == expected
+
+
+class TopologyTest(SimpleTestCase):
+
+    def test_adjacent_polygons_share_an_arc(self):
+        left = Polygon(((0, 0), (0, 1), (1, 1), (1, 0), (0, 0)), srid=4326)
+        right = Polygon(((1, 0), (1, 1), (2, 1), (2, 0), (1, 0)), srid=4326)
+        queryset = _FeatureQuerySet([_Feature(1, left), _Feature(2, right)])
+
+        topology = build_topology(
+            KLCityDistrict, queryset, _FeatureSerializer, quantization=3
+        )
+
+        geometries = topology["objects"]["klcitydistrict"]["geometries"]
+        arcs_left, arcs_right = (set(g["arcs"][0]) for g in geometries)
+        shared = {index if index >= 0 else ~index for index in arcs_left} & {
+            index if index >= 0 else ~index for index in arcs_right
+        }
+        self.assertEqual(len(shared), 1)
+
+        rings = decode_topology_rings(topology)
+        self.assertTrue(same_ring(rings[1][0], [tuple(c) for c in left.coords[0]]))
+        self.assertTrue(same_ring(rings[2][0], [tuple(c) for c in right.coords[0]]))
+
+
+class WikiVirtualIdTest(SimpleTestCase):
+
+    def test_objects_at_one_location_share_their_id(self):
+        from ingestor.datapipe.steps.transforms.wiki import assign_virtual_ids
+
+        rows = [
+            {"name": "A", "geometry": Point(7.77, 49.44)},
+            {"name": "B", "geometry": Point(7.77, 49.44)},
+            {"name": "C", "geometry": Point(7.78, 49.45)},
+        ]
+        assign_virtual_ids(rows)
+
+        self.assertEqual(rows[0]["virtual_id"], hashlib.md5(b"49.44:7.77").hexdigest())
+        self.assertEqual(rows[0]["virtual_id"], rows[1]["virtual_id"])
+        self.assertNotEqual(rows[0]["virtual_id"], rows[2]["virtual_id"])
+
+    def test_ids_do_not_depend_on_the_row_order(self):
+        from ingestor.datapipe.steps.transforms.wiki import assign_virtual_ids
+
+        rows = [
+            {"name": name, "geometry": Point(7.77 + i / 100, 49.44)}
+            for i, name in enumerate(["A", "B", "C"])
+        ]
+        expected = {row["name"]: row["virtual_id"] for row in assign_virtual_ids([dict(r) for r in rows])}
+        reordered = assign_virtual_ids([dict(r) for r in reversed(rows)])
+        self.assertEqual({row["name"]: row["virtual_id"] for row in reordered}, expected)
+
+
+class CityDistrictIndexTest(SimpleTestCase):
+
+    def test_district_names_of_geometries(self):
+        import geopandas as gpd
+        from ingestor.utils.geo_districts import (
+            OUTSIDE_DISTRICT_NAME, UNKNOWN_DISTRICT_NAME, CityDistrictIndex,
+        )
+
+        districts = gpd.GeoDataFrame(
+            {"Name": ["Nord", "Innenstadt"]},
+            geometry=[box(0, 1, 1, 2), box(0, 0, 1, 1)],
+            crs="EPSG:4326",
+        )
+        index = CityDistrictIndex(districts)
+
+        names = index.get_district_names([
+            Point(0.5, 0.5),
+            LineString([(0.5, 0.5), (0.5, 1.5)]),
+            Point(5, 5),
+            None,
+        ])
+        self.assertEqual(
+            list(names),
+            ["Innenstadt", "Innenstadt, Nord", OUTSIDE_DISTRICT_NAME, UNKNOWN_DISTRICT_NAME],
+        )
@@ -0,0 +1,235 @@
+# Copyright (c) 2025 Vision Impulse GmbH
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# Authors: Benjamin Bischke
+
+import logging
+
+from django.conf import settings
+from django.utils.timezone import now
+from rest_framework.renderers import JSONRenderer
+
+from .models import MaterializedTopology
+
+logger = logging.getLogger("webapp")
+
+# Polygon layers sharing most of their boundaries, served as TopoJSON (?format=topojson)
+TOPOLOGY_MODELS = ["KLCityDistrict", "KLParkingZone", "KLLandUsePlan"]
+
+
+class TopoJSONRenderer(JSONRenderer):
+    """Enables `?format=topojson` on the geo viewsets, see `render_topology`."""
+
+    format = "topojson"
+
+
+def is_topology_model(model):
+    return model.__name__ in TOPOLOGY_MODELS
+
+
+def _polygon_rings(geometry):
+    """Return the polygons of `geometry` as lists of rings (coordinate tuples)."""
+    if geometry.geom_type == "Polygon":
+        polygons = [geometry]
+    elif geometry.geom_type == "MultiPolygon":
+        polygons = list(geometry)
+    else:
+        return []
+    return [[ring.coords for ring in polygon] for polygon in polygons]
+
+
+def _quantize_ring(coords, transform):
+    """
+    Snap the coordinates of a ring to the integer grid of `transform` and
+    return it as open ring, or None if it collapses.
+    """
+    (kx, ky), (x0, y0) = transform["scale"], transform["translate"]
+    ring = []
+    for x, y, *_ in coords:
+        point = (round((x - x0) / kx), round((y - y0) / ky))
+        if not ring or ring[-1] != point:
+            ring.append(point)
+    if len(ring) > 1 and ring[0] == ring[-1]:
+        ring.pop()
+    return ring if len(ring) >= 3 else None
+
+
+def _find_junctions(rings):
+    """Points where rings meet with different neighbours, arcs are cut there."""
+    neighbours = {}
+    junctions = set()
+    for ring in rings:
+        for i, point in enumerate(ring):
+            pair = tuple(sorted((ring[i - 1], ring[(i + 1) % len(ring)])))
+            if neighbours.setdefault(point, pair) != pair:
+                junctions.add(point)
+    return junctions
+
+
+def _cut_ring(ring, junctions):
+    """Split an open ring into arcs at the junctions."""
+    starts = [i for i, point in enumerate(ring) if point in junctions]
+    if not starts:
+        # Rings without junctions form a closed arc, starting at the smallest
+        # point so that rings shared as a whole are detected as duplicates
+        start = ring.index(min(ring))
+        ring = ring[start:] + ring[:start]
+        return [ring + [ring[0]]]
+
+    ring = ring[starts[0]:] + ring[:starts[0]]
+    arcs, arc = [], [ring[0]]
+    for point in ring[1:] + [ring[0]]:
+        arc.append(point)
+        if point in junctions:
+            arcs.append(arc)
+            arc = [point]
+    return arcs
+
+
+class _ArcIndex:
+    """Stores each arc once, references to reversed arcs are encoded as ~index."""
+
+    def __init__(self):
+        self.arcs = []
+        self.index = {}
+
+    def add(self, arc):
+        key = tuple(arc)
+        if key in self.index:
+            return self.index[key]
+        if key[::-1] in self.index:
+            return ~self.index[key[::-1]]
+        self.index[key] = len(self.arcs)
+        self.arcs.append(arc)
+        return self.index[key]
+
+
+def _delta_encode(arc):
+    encoded = [list(arc[0])]
+    for (x0, y0), (x1, y1) in zip(arc, arc[1:]):
+        encoded.append([x1 - x0, y1 - y0])
+    return encoded
+
+
+def build_topology(model, queryset=None, serializer_class=None, context=None, quantization=None):
+    """
+    Build the TopoJSON Topology of the polygons of `queryset` (default: the full
+    geo queryset of `model`). Coordinates are quantized to a grid of
+    `quantization` (GEO_TOPOJSON_QUANTIZATION) steps per axis, boundaries
+    shared by neighbouring features are stored as a single arc. Features keep
+    their full polygons and the properties of the GeoJSON endpoint.
+    """
+    from .serializers.geo_serializers import create_geo_serializer
+    from .views.viewset_geo import get_geo_queryset
+
+    if queryset is None:
+        queryset = get_geo_queryset(model)
+    if serializer_class is None:
+        serializer_class = create_geo_serializer(model)
+    serializer = serializer_class(context=context or {})
+    quantization = quantization or settings.GEO_TOPOJSON_QUANTIZATION
+
+    objects = [obj for obj in queryset.iterator() if obj.geometry]
+    extents = [obj.geometry.extent for obj in objects]
+    bbox = [
+        min((e[0] for e in extents), default=0), min((e[1] for e in extents), default=0),
+        max((e[2] for e in extents), default=0), max((e[3] for e in extents), default=0),
+    ]
+    transform = {
+        "scale": [
+            (bbox[2] - bbox[0]) / (quantization - 1) or 1,
+            (bbox[3] - bbox[1]) / (quantization - 1) or 1,
+        ],
+        "translate": [bbox[0], bbox[1]],
+    }
+
+    # Quantize first, so that nearly identical vertices of neighbours coincide
+    quantized = []
+    for obj in objects:
+        polygons = []
+        for rings in _polygon_rings(obj.geometry):
+            rings = [_quantize_ring(coords, transform) for coords in rings]
+            if rings and rings[0] is not None:
+                polygons.append([ring for ring in rings if ring is not None])
+        quantized.append((obj, polygons))
+
+    junctions = _find_junctions(
+        ring for _, polygons in quantized for rings in polygons for ring in rings
+    )
+    arc_index = _ArcIndex()
+    geometries = []
+    for obj, polygons in quantized:
+        polygon_arcs = [
+            [[arc_index.add(arc) for arc in _cut_ring(ring, junctions)] for ring in rings]
+            for rings in polygons
+        ]
+        if not polygon_arcs:
+            geometry = {"type": None}
+        elif len(polygon_arcs) == 1:
+            geometry = {"type": "Polygon", "arcs": polygon_arcs[0]}
+        else:
+            geometry = {"type": "MultiPolygon", "arcs": polygon_arcs}
+        geometry["id"] = serializer.get_id(obj)
+        geometry["properties"] = serializer.get_properties(obj)
+        geometries.append(geometry)
+
+    return {
+        "type": "Topology",
+        "bbox": bbox,
+        "transform": transform,
+        "objects": {
+            model._meta.model_name: {"type": "GeometryCollection", "geometries": geometries},
+        },
+        "arcs": [_delta_encode(arc) for arc in arc_index.arcs],
+    }
+
+
+def render_topology(model, queryset=None, serializer_class=None, context=None):
+    """Return the TopoJSON of `model` as encoded JSON."""
+    return JSONRenderer().render(build_topology(model, queryset, serializer_class, context))
+
+
+def refresh_topology(model):
+    """
+    Build and store the TopoJSON of `model`. Called after imports, see
+    `refresh_derived_data`, and on first use after admin edits.
+    """
+    if not is_topology_model(model):
+        return None
+
+    content = render_topology(model)
+    MaterializedTopology.objects.update_or_create(
+        model_name=model.__name__,
+        defaults={"content": content.decode("utf-8"), "insert_timestamp": now()},
+    )
+    logger.info("Stored TopoJSON for %s (%s bytes)", model.__name__, len(content))
+    return content
+
+
+def invalidate_topology(model):
+    """Drop the stored TopoJSON of `model`, it is rebuilt on the next request."""
+    MaterializedTopology.objects.filter(model_name=model.__name__).delete()
+
+
+def read_topology(model):
+    """Return the stored TopoJSON of `model`, building it on first use."""
+    content = (
+        MaterializedTopology.objects.filter(model_name=model.__name__)
+        .values_list("content", flat=True)
+        .first()
+    )
+    if content is None:
+        return refresh_topology(model)
+    return content.encode("utf-8")
@@ -24,6 +24,9 @@ from .views.viewset_events import KLLeisureEventViewSet, KLWGAEventViewSet
 from .views.viewset_events import KLCouncilEventViewSet, KLConstructionSiteViewSet
 from .views.viewset_events import DemographicDataViewSet, GrafanaDashboardViewSet
 from .views.viewset_elections import ElectionViewSet, ElectionResultViewSet
+from .views.viewset_tiles import geo_tile_view
+from .views.viewset_batch import GeoBatchView
+from .views.viewset_nearby import NearbyView
 from .models.events import events
 from .models import API_GEO_MODELS, API_WIKI_MODLES
 
@@ -55,4 +58,10 @@ router.register(r'demographics', DemographicDataViewSet, basename='demographics'
 # Create and register viewset for dashboards
 router.register(r'dashboards', GrafanaDashboardViewSet, basename='dashboards')
 
-
+# Vector tiles for each geomodel, combined fetch of several geo layers and
+# the nearest objects across layers
+urlpatterns = [
+    path("tiles/<str:model_name>/<int:z>/<int:x>/<int:y>.mvt", geo_tile_view, name="geo-tile"),
+    path("geo/batch/", GeoBatchView.as_view(), name="geo-batch"),
+    path("nearby/", NearbyView.as_view(), name="nearby"),
+]
@@ -0,0 +1,131 @@
+# Copyright (c) 2025 Vision Impulse GmbH
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# Authors: Benjamin Bischke
+
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from rest_framework.response import Response
+
+from frontend_config.utils import get_model_config_version
+from ..changelog import get_data_version, get_feature_changes, parse_since
+
+
+class NotModified(APIException):
+    status_code = status.HTTP_304_NOT_MODIFIED
+
+
+class ConditionalGetMixin:
+    """
+    Answer GET requests with `304 Not Modified` if the client already has the
+    current data. The validator is computed per model and filter set from
+    max(insert_timestamp), the row count, the data version (bumped by admin
+    edits) and the frontend config version, before any serialization happens.
+    """
+
+    # Field holding the import timestamp, may span a relation
+    conditional_timestamp_field = "insert_timestamp"
+
+    def get_conditional_queryset(self):
+        if self.action == "list":
+            return self.filter_queryset(self.get_queryset())
+        return self.get_queryset()
+
+    def get_conditional_validators(self, request):
+        """Return (etag, last_modified timestamp or None)."""
+        queryset = self.get_conditional_queryset()
+        stats = queryset.order_by().aggregate(
+            last_modified=Max(self.conditional_timestamp_field), count=Count("pk")
+        )
+        last_modified = stats["last_modified"]
+
+        token = "|".join([
+            queryset.model._meta.label_lower,
+            request.get_full_path(),
+            last_modified.isoformat() if last_modified else "",
+            str(stats["count"]),
+            str(get_data_version(queryset.model)),
+            get_model_config_version(),
+        ])
+        etag = quote_etag(hashlib.md5(token.encode("utf-8")).hexdigest())
+        return etag, (last_modified.timestamp() if last_modified else None)
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+
+        self.conditional_etag, self.conditional_last_modified = None, None
+        if request.method not in ("GET", "HEAD"):
+            return
+
+        etag, last_modified = self.get_conditional_validators(request)
+        self.conditional_etag, self.conditional_last_modified = etag, last_modified
+
+        response = get_conditional_response(
+            request._request, etag=etag, last_modified=last_modified
+        )
+        if response is not None and response.status_code == status.HTTP_304_NOT_MODIFIED:
+            raise NotModified()
+
+    def handle_exception(self, exc):
+        if isinstance(exc, NotModified):
+            return Response(status=status.HTTP_304_NOT_MODIFIED)
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if response.status_code in (status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED):
+            if getattr(self, "conditional_etag", None):
+                response["ETag"] = self.conditional_etag
+            if getattr(self, "conditional_last_modified", None):
+                response["Last-Modified"] = http_date(self.conditional_last_modified)
+        return response
+
+
+class DeltaSyncMixin:
+    """
+    Answer list requests with `?since=<run id|timestamp>` with the changes of
+    all imports after that run: the current version of inserted and updated
+    objects and the feature keys of deleted ones. "run" is the value to pass
+    as `since` next time, with "reset" the client has to replace all objects.
+    Filters only apply to the returned objects, not to the deleted keys.
+    """
+
+    def get_delta_queryset(self, request, queryset=None):
+        """Return (changes, filtered queryset of the inserted and updated objects)."""
+        if queryset is None:
+            queryset = self.get_queryset()
+        changes = get_feature_changes(queryset.model, parse_since(request.query_params["since"]))
+        queryset = self.filter_queryset(queryset)
+        if not changes["reset"]:
+            queryset = queryset.filter(feature_key__in=changes["upserted"])
+        return changes, queryset
+
+    def list(self, request, *args, **kwargs):
+        if "since" not in request.query_params:
+            return super().list(request, *args, **kwargs)
+
+        changes, queryset = self.get_delta_queryset(request)
+        serializer = self.get_serializer(queryset, many=True)
+        return Response({
+            "run": changes["run"],
+            "reset": changes["reset"],
+            "deleted": changes["deleted"],
+            "results": serializer.data,
+        })
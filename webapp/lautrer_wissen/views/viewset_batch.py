@@ -0,0 +1,112 @@
+# Copyright (c) 2025 Vision Impulse GmbH
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# Authors: Benjamin Bischke
+
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import connection
+from django.http import HttpResponse
+from rest_framework.exceptions import ValidationError
+from rest_framework.views import APIView
+
+from ..streaming import streaming_response
+from .viewset_geo import GEO_VIEWSETS, should_stream
+
+MAX_BATCH_LAYERS = 50
+
+
+def _render_content(content):
+    """Join the chunks of a streamed layer."""
+    if isinstance(content, bytes):
+        return content
+    return b"".join(content)
+
+
+class GeoBatchView(APIView):
+    """
+    Handles GET /api/geo/batch/?layers=osmnaturaltrees,klparkingzone&bbox=...
+
+    Returns the FeatureCollections of several geo layers keyed by layer name.
+    All other parameters (bbox, zoom, attribute filters, stream) are applied
+    to each layer as on /api/geo/<layer>/, so snapshots and merged features
+    are reused. Unstreamed layers are rendered concurrently.
+    """
+
+    def get(self, request):
+        layer_names = self.get_layer_names(request)
+        views = [(name, self.get_layer_view(name, request)) for name in layer_names]
+
+        if should_stream(request):
+            return streaming_response(request, self.stream_layers(views, request))
+
+        if settings.GEO_BATCH_MAX_WORKERS > 1 and len(views) > 1:
+            with ThreadPoolExecutor(max_workers=settings.GEO_BATCH_MAX_WORKERS) as executor:
+                contents = list(
+                    executor.map(lambda item: self.render_in_thread(item[1], request), views)
+                )
+        else:
+            contents = [_render_content(view.render_layer(request)) for _, view in views]
+
+        return HttpResponse(
+            self.join_layers(zip(layer_names, contents)), content_type="application/json"
+        )
+
+    def get_layer_names(self, request):
+        layers = request.query_params.get("layers", "")
+        layer_names = list(dict.fromkeys(name.strip().lower() for name in layers.split(",") if name.strip()))
+        if not layer_names:
+            raise ValidationError({"layers": "Expected a comma separated list of layers."})
+        if len(layer_names) > MAX_BATCH_LAYERS:
+            raise ValidationError({"layers": f"At most {MAX_BATCH_LAYERS} layers per request."})
+
+        unknown = [name for name in layer_names if name not in GEO_VIEWSETS]
+        if unknown:
+            raise ValidationError({"layers": f"Unknown layers: {', '.join(unknown)}"})
+        return layer_names
+
+    def get_layer_view(self, layer_name, request):
+        view = GEO_VIEWSETS[layer_name]()
+        view.request = request
+        view.args = ()
+        view.kwargs = {}
+        view.format_kwarg = None
+        view.action = "list"
+        return view
+
+    def render_in_thread(self, view, request):
+        try:
+            return _render_content(view.render_layer(request))
+        finally:
+            # Worker threads open their own database connection
+            connection.close()
+
+    def join_layers(self, layers):
+        return b"{" + b",".join(
+            json.dumps(name).encode("utf-8") + b":" + content for name, content in layers
+        ) + b"}"
+
+    def stream_layers(self, views, request):
+        yield b"{"
+        for index, (name, view) in enumerate(views):
+            yield (b"," if index else b"") + json.dumps(name).encode("utf-8") + b":"
+            content = view.render_layer(request)
+            if isinstance(content, bytes):
+                yield content
+            else:
+                yield from content
+        yield b"}"
@@ -27,9 +27,10 @@ from django.db.models import Count
 from rest_framework import generics
 from ..models import Election, ElectionResult
 from ..serializers.election_serializer import ElectionSerializer, ElectionDetailSerializer, ElectionResultSerializer
+from .mixins import ConditionalGetMixin
 
 
-class ElectionViewSet(viewsets.ReadOnlyModelViewSet):
+class ElectionViewSet(ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
     queryset = Election.objects.all()
 
     def get_serializer_class(self):
@@ -38,6 +39,7 @@ class ElectionViewSet(viewsets.ReadOnlyModelViewSet):
         return ElectionSerializer
 
 
-class ElectionResultViewSet(viewsets.ReadOnlyModelViewSet):
+class ElectionResultViewSet(ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
     queryset = ElectionResult.objects.all()
+    conditional_timestamp_field = "election__insert_timestamp"
     serializer_class = ElectionResultSerializer
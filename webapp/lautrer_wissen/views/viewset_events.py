@@ -17,11 +17,13 @@
 
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import viewsets
-from rest_framework.filters import OrderingFilter, SearchFilter
+from rest_framework.filters import OrderingFilter
 from rest_framework.pagination import PageNumberPagination
 from django.utils.timezone import now  
 
 from ..serializers.generic_serializer import create_generic_serializer
+from ..filters import BoundingBoxFilterBackend, FullTextSearchFilter, SparseFieldsFilterBackend
+from .mixins import ConditionalGetMixin, DeltaSyncMixin
 
 import django_filters
 from ..models.events.events import KLLeisureEvent
@@ -93,9 +95,9 @@ class DemographicDataFilter(django_filters.FilterSet):
 # ------------------------------------------------------------------------------------
 
 
-class KLLeisureEventViewSet(viewsets.ReadOnlyModelViewSet):
+class KLLeisureEventViewSet(DeltaSyncMixin, ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
     serializer_class = create_generic_serializer(KLLeisureEvent)
-    filter_backends = [DjangoFilterBackend, OrderingFilter, SearchFilter]
+    filter_backends = [DjangoFilterBackend, OrderingFilter, FullTextSearchFilter, SparseFieldsFilterBackend]
     filterset_class = KLLeisureEventFilter
     search_fields = ['caption', 'caption_addition', 'description'] # category?
     ordering_fields = ['id', 'dstart',]
@@ -110,10 +112,11 @@ class KLLeisureEventViewSet(viewsets.ReadOnlyModelViewSet):
         ).order_by('dstart')
 
 
-class KLWGAEventViewSet(viewsets.ReadOnlyModelViewSet):
+class KLWGAEventViewSet(DeltaSyncMixin, ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
     
     serializer_class = create_generic_serializer(WGAEvent)
-    filter_backends = [DjangoFilterBackend, OrderingFilter, SearchFilter]
+    filter_backends = [DjangoFilterBackend, BoundingBoxFilterBackend, OrderingFilter, FullTextSearchFilter,
+                       SparseFieldsFilterBackend]
     filterset_class = KLWGAEventFilter
     search_fields = ['title', 'subtitle', 'description']
     ordering_fields = ['id', 'date',]
@@ -126,10 +129,10 @@ class KLWGAEventViewSet(viewsets.ReadOnlyModelViewSet):
         ).order_by('date')
     
 
-class KLCouncilEventViewSet(viewsets.ReadOnlyModelViewSet):
+class KLCouncilEventViewSet(DeltaSyncMixin, ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
     
     serializer_class = create_generic_serializer(KLCouncilEvent)
-    filter_backends = [DjangoFilterBackend, OrderingFilter, SearchFilter]
+    filter_backends = [DjangoFilterBackend, OrderingFilter, FullTextSearchFilter, SparseFieldsFilterBackend]
     filterset_class = KLCouncilEventFilter
     search_fields = ['title', 'committee', ]
     ordering_fields = ['date',]
@@ -142,10 +145,11 @@ class KLCouncilEventViewSet(viewsets.ReadOnlyModelViewSet):
         ).order_by('date')
 
 
-class KLConstructionSiteViewSet(viewsets.ReadOnlyModelViewSet):
+class KLConstructionSiteViewSet(DeltaSyncMixin, ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
     
     serializer_class = create_generic_serializer(KLConstructionSite)
-    filter_backends = [DjangoFilterBackend, OrderingFilter, SearchFilter]
+    filter_backends = [DjangoFilterBackend, BoundingBoxFilterBackend, OrderingFilter, FullTextSearchFilter,
+                       SparseFieldsFilterBackend]
     filterset_class = ConstructionSiteFilter
     search_fields = ['bez', ]
     ordering_fields = ['baustart',]
@@ -158,10 +162,10 @@ class KLConstructionSiteViewSet(viewsets.ReadOnlyModelViewSet):
         ).order_by('baustart')
 
 
-class DemographicDataViewSet(viewsets.ReadOnlyModelViewSet):
+class DemographicDataViewSet(ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
     
     serializer_class = create_generic_serializer(DemographicData)
-    filter_backends = [DjangoFilterBackend, OrderingFilter, SearchFilter]
+    filter_backends = [DjangoFilterBackend, OrderingFilter, FullTextSearchFilter, SparseFieldsFilterBackend]
     filterset_class = DemographicDataFilter
     ordering_fields = ['city_district_name',]
     pagination_class = PageNumberPagination
@@ -185,10 +189,10 @@ class DemographicDataViewSet(viewsets.ReadOnlyModelViewSet):
         })
 
 
-class GrafanaDashboardViewSet(viewsets.ReadOnlyModelViewSet):
+class GrafanaDashboardViewSet(ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
     
     serializer_class = create_generic_serializer(KLSensorGrafanaDashboard)
-    filter_backends = [DjangoFilterBackend, OrderingFilter, SearchFilter]
+    filter_backends = [DjangoFilterBackend, OrderingFilter, FullTextSearchFilter, SparseFieldsFilterBackend]
     ordering_fields = ['id',]
     pagination_class = PageNumberPagination
 
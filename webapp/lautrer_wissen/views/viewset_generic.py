@@ -17,10 +17,12 @@
 
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import viewsets
-from rest_framework.filters import OrderingFilter, SearchFilter
+from rest_framework.filters import OrderingFilter
 from rest_framework.pagination import PageNumberPagination
 
 from ..serializers.generic_serializer import create_generic_serializer
+from .mixins import ConditionalGetMixin
+from ..filters import FullTextSearchFilter, SparseFieldsFilterBackend
 
 
 def create_generic_viewset(model):
@@ -32,11 +34,11 @@ def create_generic_viewset(model):
 
     return type(
         viewset_name,
-        (viewsets.ReadOnlyModelViewSet,),  # Inherit from ModelViewSet
+        (ConditionalGetMixin, viewsets.ReadOnlyModelViewSet),  # Inherit from ModelViewSet
         {
             "queryset": model.objects.all(),  # Assign queryset dynamically
             "serializer_class": serializer_class,  # Assign serializer dynamically
-            "filter_backends": [DjangoFilterBackend, OrderingFilter, SearchFilter],
+            "filter_backends": [DjangoFilterBackend, OrderingFilter, FullTextSearchFilter, SparseFieldsFilterBackend],
             "search_fields": ["name"] if "name" in [f.name for f in model._meta.get_fields()] else [],
             "ordering_fields": ["id"],
             "pagination_class": PageNumberPagination,
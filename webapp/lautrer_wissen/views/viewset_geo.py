@@ -18,6 +18,8 @@
 from ..serializers.geo_serializers import create_geo_serializer
 
 from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import OrderingFilter, SearchFilter
 
@@ -27,169 +29,431 @@ from django.db.models import Q
 from django.db import models
 import django_filters
 from rest_framework.response import Response
+from rest_framework.renderers import JSONRenderer
+from rest_framework.settings import api_settings
+from rest_framework.utils.encoders import JSONEncoder
+from django.conf import settings
+from django.http import HttpResponse
 import json
-from frontend_config.utils import get_model_field_mapping
+from frontend_config.utils import get_model_field_mapping, get_model_config_version
+from ..streaming import streaming_response
+from ..snapshots import geo_snapshot_response, read_geo_snapshot, store_geo_snapshot
+from ..filters import BoundingBoxFilterBackend, SparseFieldsFilterBackend, get_sparse_context
+from ..filters import get_requested_lod_field, get_requested_precision, parse_bbox, parse_zoom
+from ..clusters import get_clusters
+from .mixins import ConditionalGetMixin, DeltaSyncMixin
+from ..merged_features import merged_feature_collection
+from ..geo_sql import render_feature_collection_sql, supports_sql_rendering
+from ..exports import EXPORT_FORMATS, FlatGeobufRenderer, GeoParquetRenderer, export_response
+from ..topology import TopoJSONRenderer, is_topology_model, read_topology
 
 class MultiCategoryFilter(django_filters.BaseInFilter, django_filters.CharFilter):
     pass
 
 
+def _is_missing_filter(queryset, name, value, *, field_name):
+    if value: # ?field__missing=true
+        return queryset.filter(
+            models.Q(**{f"{field_name}__isnull": True}) | models.Q(**{f"{field_name}": ""})
+        )
+    else: # ?field__missing=false
+        return queryset.exclude(
+            models.Q(**{f"{field_name}__isnull": True}) | models.Q(**{f"{field_name}": ""})
+        )
+
+
+def build_dynamic_geo_filters(model):
+    """Return the filters of `model` for its configured fields, keyed by parameter name."""
+    try:
+        fields_map, _visible_name = get_model_field_mapping(model)
+    except Exception:
+        fields_map = getattr(model, "MAP_FIELDS", {}) or {}
+
+    filters = {}
+    for model_field_name, public_field_name in fields_map.items():
+        try:
+            model_field = model._meta.get_field(model_field_name)
+        except Exception:
+            # field not present in the model, skip it
+            continue
+
+        if isinstance(model_field, (models.DateField, models.DateTimeField)):
+            continue
+
+        filters[public_field_name] = CharFilter(field_name=model_field_name, lookup_expr="iexact")
+
+        # Define a custom "not equal" filter function (e.g., `?access__ne=Kunden`)
+        def ne_filter(queryset, name, value, field_name=model_field_name):
+            # Make sure to exclude where model_field_name matches value
+            return queryset.exclude(**{field_name: value})
+
+        filters[f"{public_field_name}__ne"] = CharFilter(method=ne_filter)
+        filters[f"{public_field_name}__in"] = MultiCategoryFilter(field_name=model_field_name,
+                                                                    lookup_expr='in')
+
+        filters[f"{public_field_name}__gte"] = django_filters.NumberFilter(
+                field_name=model_field_name, lookup_expr="gte")
+
+        filters[f"{public_field_name}__missing"] = BooleanFilter(
+            method=lambda qs, name, value, field_name=model_field_name:
+            _is_missing_filter(qs, name, value, field_name=field_name)
+        )
+    return filters
+
+
 def create_dynamic_geo_filter(model):
     """
-    Return a FilterSet class for `model` that builds filters lazily on instantiation.
-    This avoids DB access at import time and avoids async/sync ORM issues.
+    Return a FilterSet class for `model` with filters for all configured fields.
+    Built on first use (no DB access at import time), see `get_dynamic_geo_filter`.
     """
+    meta = type("Meta", (), {"model": model, "fields": []})
+    return type(
+        f"{model.__name__}DynamicGeoFilter",
+        (FilterSet,),
+        {"Meta": meta, **build_dynamic_geo_filters(model)},
+    )
 
-    class DynamicGeoFilter(FilterSet):
-        # Provide a Meta placeholder; we'll set .model after class creation.
-        class Meta:
-            model = None
-            fields = []
-
-        def __init__(self, *args, **kwargs):
-            super().__init__(*args, **kwargs)
-
-            # Compute mapping lazily (per-request time).
-            try:
-                fields_map, _visible_name = get_model_field_mapping(model)
-            except Exception:
-                fields_map = getattr(model, "MAP_FIELDS", {}) or {}
-
-            rel_fields = []
-
-            def is_missing_filter(queryset, name, value, *, field_name):
-                if value: # ?field__missing=true
-                    return queryset.filter(
-                        models.Q(**{f"{field_name}__isnull": True}) | models.Q(**{f"{field_name}": ""})
-                    )
-                else: # ?field__missing=false
-                    return queryset.exclude(
-                        models.Q(**{f"{field_name}__isnull": True}) | models.Q(**{f"{field_name}": ""})
-                    )
-                
-            # Attach dynamic filters to this instance
-            for model_field_name, public_field_name in fields_map.items():
-                try:
-                    model_field = model._meta.get_field(model_field_name)
-                except Exception:
-                    # field not present in the model, skip it
-                    continue
-
-                if isinstance(model_field, (models.DateField, models.DateTimeField)):
-                    continue
-        
-                rel_fields.append(public_field_name)
-
-                self.filters[public_field_name] = CharFilter(field_name=model_field_name, lookup_expr="iexact")
-
-                # Define a custom "not equal" filter function (e.g., `?access__ne=Kunden`)
-                def ne_filter(queryset, name, value, field_name=model_field_name):
-                    # Make sure to exclude where model_field_name matches value
-                    return queryset.exclude(**{field_name: value})
-                
-                self.filters[f"{public_field_name}__ne"] = CharFilter(method=ne_filter)
-                self.filters[f"{public_field_name}__in"] = MultiCategoryFilter(field_name=model_field_name,
-                                                                                lookup_expr='in')
-                
-                self.filters[f"{public_field_name}__gte"] = django_filters.NumberFilter(
-                        field_name=model_field_name, lookup_expr="gte")
-            
-                self.filters[f"{public_field_name}__missing"] = BooleanFilter(
-                    method=lambda qs, name, value, field_name=model_field_name: 
-                    is_missing_filter(qs, name, value, field_name=field_name)
-                )
-
-            # Update Meta.fields so introspection / docs see them
-            try:
-                self._meta.fields = rel_fields
-            except Exception:
-                pass
-
-    # Safely set Meta.model and Meta.fields after class creation
-    DynamicGeoFilter.Meta.model = model
-    DynamicGeoFilter.Meta.fields = []  # we populate runtime filters in __init__
-    return DynamicGeoFilter
 
+# FilterSet class and config version it was built for, per model
+_dynamic_geo_filters = {}
 
-def create_geo_viewset(model):
-    """Dynamically create a viewset for a given model."""
 
-    serializer_class = create_geo_serializer(model)
-    dynamic_filter_class = create_dynamic_geo_filter(model)
+def get_dynamic_geo_filter(model):
+    """
+    Return the cached FilterSet class of `model`, rebuilt when the model
+    configuration (field names and visibility) changes.
+    """
+    version = get_model_config_version()
+    cached = _dynamic_geo_filters.get(model)
+    if cached is None or cached[0] != version:
+        cached = (version, create_dynamic_geo_filter(model))
+        _dynamic_geo_filters[model] = cached
+    return cached[1]
 
-    viewset_name = f"{model.__name__}ViewSet"
 
+def get_geo_queryset(model, lod_field=None):
+    """
+    Base queryset of the geo endpoint for `model`. Simplified geometries
+    other than `lod_field` are not loaded.
+    """
     if 'latitude' in [f.name for f in model._meta.get_fields()]:
         queryset = model.objects.filter(latitude__isnull=False)
     else:
         queryset = model.objects.all()
 
-    def merge_features_by_geometry(feature_collection):
-        merged = {}
-        for feature in feature_collection["features"]:
-            geometry = feature["geometry"]
-            if isinstance(geometry, str):
-                geometry = json.loads(geometry)
-
-            geometry_key = tuple(geometry["coordinates"])
-            if geometry_key not in merged:
-                merged[geometry_key] = {
-                    "type": "Feature",
-                    "geometry": geometry,
-                    "properties": {}
-                }
-
-            for key, value in feature["properties"].items():
-                if key not in merged[geometry_key]["properties"]:
-                    merged[geometry_key]["properties"][key] = [value]
-                else:
-                    if value not in merged[geometry_key]["properties"][key]:
-                        merged[geometry_key]["properties"][key].append(value)
-
-        merged_features = []
-        for feature in merged.values():
-            props = feature["properties"]
-            final_props = {}
-
-            for key, values in props.items():
-                final_props[key] = values[0] if len(values) == 1 else values
-
-            if "size_radius_meters" in final_props:
-                del final_props["size_radius_meters"]
-            if "dashboard_url" in final_props:
-                del final_props["dashboard_url"]
-            if "timefilters" in final_props:
-                del final_props["timefilters"]
-            if "id" in final_props:
-                del final_props["id"]
-            feature["properties"] = final_props
-            merged_features.append(feature)
-        
-        feature_collection["features"] = merged_features
-        return feature_collection
+    # Deterministic feature order, also used by the SQL rendering
+    queryset = queryset.order_by(model._meta.pk.name)
+
+    lod_fields = [name for name, _, _ in getattr(model, "LOD_LEVELS", [])]
+    unused_lod_fields = [name for name in lod_fields if name != lod_field]
+    if unused_lod_fields:
+        queryset = queryset.defer(*unused_lod_fields)
+    return queryset
+
+
+def merge_features_by_geometry(feature_collection):
+    merged = {}
+    for feature in feature_collection["features"]:
+        geometry = feature["geometry"]
+        if isinstance(geometry, str):
+            geometry = json.loads(geometry)
+
+        geometry_key = tuple(geometry["coordinates"])
+        if geometry_key not in merged:
+            merged[geometry_key] = {
+                "type": "Feature",
+                "geometry": geometry,
+                "properties": {}
+            }
+
+        for key, value in feature["properties"].items():
+            if key not in merged[geometry_key]["properties"]:
+                merged[geometry_key]["properties"][key] = [value]
+            else:
+                if value not in merged[geometry_key]["properties"][key]:
+                    merged[geometry_key]["properties"][key].append(value)
+
+    merged_features = []
+    for feature in merged.values():
+        props = feature["properties"]
+        final_props = {}
+
+        for key, values in props.items():
+            final_props[key] = values[0] if len(values) == 1 else values
+
+        if "size_radius_meters" in final_props:
+            del final_props["size_radius_meters"]
+        if "dashboard_url" in final_props:
+            del final_props["dashboard_url"]
+        if "timefilters" in final_props:
+            del final_props["timefilters"]
+        if "id" in final_props:
+            del final_props["id"]
+        feature["properties"] = final_props
+        merged_features.append(feature)
+    
+    feature_collection["features"] = merged_features
+    return feature_collection
+
+
+MERGED_FEATURE_MODELS = ["KLSensorGrafanaDashboard", 'WikiStolperstein']
+
+
+def render_feature_collection(model, queryset=None, serializer_class=None, context=None):
+    """
+    Serialize `queryset` (default: the full geo queryset of `model`) into a
+    FeatureCollection, merging overlapping features where required.
+    """
+    if queryset is None:
+        # Merged layers are materialized at import time
+        if model.__name__ in MERGED_FEATURE_MODELS:
+            return merged_feature_collection(model)
+        queryset = get_geo_queryset(model)
+    if serializer_class is None:
+        serializer_class = create_geo_serializer(model)
+
+    serializer = serializer_class(queryset, many=True, context=context or {})
+    data = serializer.data
+
+    # Merge overlapping features
+    if model.__name__ in MERGED_FEATURE_MODELS:
+        data = merge_features_by_geometry(data)
+    return data
+
+
+def render_feature_collection_json(model, queryset=None, serializer_class=None, context=None):
+    """
+    Render the FeatureCollection of `queryset` to encoded JSON. Layers that
+    need no Python side formatting are rendered inside PostgreSQL.
+    """
+    if queryset is None:
+        queryset = get_geo_queryset(model)
+    if settings.GEO_SQL_RENDERING_ENABLED and supports_sql_rendering(model):
+        context = context or {}
+        return render_feature_collection_sql(
+            model,
+            queryset,
+            lod_field=context.get("lod_field"),
+            fields=context.get("fields"),
+            include_geometry=context.get("include_geometry", True),
+            precision=context.get("precision"),
+        )
+
+    data = render_feature_collection(model, queryset, serializer_class, context)
+    return JSONRenderer().render(data)
+
+
+def stream_feature_collection(queryset, serializer_class, context=None, chunk_size=None):
+    """
+    Yield the FeatureCollection of `queryset` as encoded JSON chunks, one
+    Feature at a time, so memory usage does not grow with the layer size.
+    """
+    chunk_size = chunk_size or settings.GEO_STREAM_CHUNK_SIZE
+    serializer = serializer_class(context=context or {})
+
+    yield b'{"type":"FeatureCollection","features":['
+    separator = b""
+    for obj in queryset.iterator(chunk_size=chunk_size):
+        feature = serializer.to_representation(obj)
+        yield separator + json.dumps(
+            feature, cls=JSONEncoder, ensure_ascii=False, separators=(",", ":")
+        ).encode("utf-8")
+        separator = b","
+    yield b"]}"
+
+
+def should_stream(request):
+    return request.query_params.get("stream", "").lower() in ("1", "true", "yes")
+
+
+# Parameters that do not change the content of a layer
+RESPONSE_OPTION_PARAMS = {"stream", "layers"}
+
+
+def is_unfiltered(request):
+    """True if the request asks for the complete layer (snapshot content)."""
+    return not set(request.query_params) - RESPONSE_OPTION_PARAMS
+
+
+# Parameters that can be answered from the stored merged features
+MERGED_FEATURE_PARAMS = RESPONSE_OPTION_PARAMS | {"bbox", "zoom"}
+
+# Geo viewset class per lowercase model name, filled by create_geo_viewset
+GEO_VIEWSETS = {}
+
+
+def create_geo_viewset(model):
+    """Dynamically create a viewset for a given model."""
+
+    serializer_class = create_geo_serializer(model)
+
+    viewset_name = f"{model.__name__}ViewSet"
+
+    queryset = get_geo_queryset(model)
+
+    def render_layer(self, request):
+        """
+        Return the FeatureCollection of this layer for `request` as encoded
+        JSON, or as an iterator of encoded chunks if streaming was requested.
+        """
+        # Unfiltered requests are answered from the pre-rendered snapshot
+        if is_unfiltered(request):
+            content = read_geo_snapshot(model)
+            if content is not None:
+                return content
+
+        # Merged layers are served from the features merged at import time
+        if model.__name__ in MERGED_FEATURE_MODELS and set(request.query_params) <= MERGED_FEATURE_PARAMS:
+            content = JSONRenderer().render(merged_feature_collection(model, request, self))
+            if is_unfiltered(request):
+                store_geo_snapshot(model, content)
+            return content
+
+        lod_field = get_requested_lod_field(request, model)
+        queryset = self.filter_queryset(get_geo_queryset(model, lod_field))
+        context = {
+            "request": request,
+            "lod_field": lod_field,
+            "precision": get_requested_precision(request),
+            **get_sparse_context(request),
+        }
+
+        # Merged layers need all features at once and can not be streamed
+        if should_stream(request) and model.__name__ not in MERGED_FEATURE_MODELS:
+            return stream_feature_collection(queryset, self.get_serializer_class(), context=context)
+
+        content = render_feature_collection_json(
+            model, queryset, self.get_serializer_class(), context=context
+        )
+
+        if is_unfiltered(request):
+            store_geo_snapshot(model, content)
+        return content
+
+    def render_changes(self, request):
+        """
+        Return the features changed after `?since=` as FeatureCollection with
+        their stable feature keys as ids, see DeltaSyncMixin.
+        """
+        if model.__name__ in MERGED_FEATURE_MODELS:
+            raise ValidationError({"since": "Not available for layers merged by coordinates."})
+
+        lod_field = get_requested_lod_field(request, model)
+        changes, queryset = self.get_delta_queryset(request, get_geo_queryset(model, lod_field))
+        context = {
+            "request": request,
+            "lod_field": lod_field,
+            "precision": get_requested_precision(request),
+            **get_sparse_context(request),
+        }
+        serializer = self.get_serializer_class()(context=context)
+
+        features = []
+        for obj in queryset.iterator(chunk_size=settings.GEO_STREAM_CHUNK_SIZE):
+            feature = serializer.to_representation(obj)
+            feature["id"] = obj.feature_key
+            features.append(feature)
+        return {
+            "type": "FeatureCollection",
+            "run": changes["run"],
+            "reset": changes["reset"],
+            "deleted": changes["deleted"],
+            "features": features,
+        }
+
+    def export_layer(self, request, export_format):
+        """Return this layer for `request` as FlatGeobuf or GeoParquet file."""
+        lod_field = get_requested_lod_field(request, model)
+        queryset = self.filter_queryset(get_geo_queryset(model, lod_field))
+        return export_response(
+            model, queryset, export_format, lod_field=lod_field, **get_sparse_context(request)
+        )
+
+    def render_layer_topology(self, request):
+        """
+        Return this layer as TopoJSON from the topology stored at import time.
+        Only the complete layer is available, building filtered topologies
+        per request is not bounded.
+        """
+        if not is_topology_model(model):
+            raise ValidationError({"format": f"TopoJSON is not available for {model.__name__}."})
+        if not set(request.query_params) <= RESPONSE_OPTION_PARAMS | {"format"}:
+            raise ValidationError({"format": "TopoJSON is only available for the complete layer."})
+        return read_topology(model)
+
+    def get_renderers(self):
+        # Exports are only available for the FeatureCollection (?format=fgb|parquet|topojson)
+        renderers = super(viewset_class, self).get_renderers()
+        if self.action != "list":
+            renderers = [
+                r for r in renderers
+                if r.format not in EXPORT_FORMATS and r.format != TopoJSONRenderer.format
+            ]
+        return renderers
 
     # Create a custom `list` method
     def merged_list(self, request, *args, **kwargs):
-        queryset = self.filter_queryset(self.get_queryset())
-        serializer = self.get_serializer(queryset, many=True, context={"request": request})
-        data = serializer.data
+        if "since" in request.query_params:
+            return Response(self.render_changes(request))
 
-        # Merge overlapping features
-        if model.__name__ in ["KLSensorGrafanaDashboard", 'WikiStolperstein']:
-            data = merge_features_by_geometry(data)
-        return Response(data)
+        export_format = request.accepted_renderer.format
+        if export_format in EXPORT_FORMATS:
+            return self.export_layer(request, export_format)
+        if export_format == TopoJSONRenderer.format:
+            return HttpResponse(
+                self.render_layer_topology(request), content_type=TopoJSONRenderer.media_type
+            )
+
+        if is_unfiltered(request):
+            response = geo_snapshot_response(model)
+            if response is not None:
+                return response
+
+        content = self.render_layer(request)
+        if isinstance(content, bytes):
+            return HttpResponse(content, content_type="application/json")
+        return streaming_response(request, content)
+
+    @action(detail=False, methods=["get"])
+    def clusters(self, request):
+        """Handles GET /api/geo/{model_name}/clusters/?bbox=&zoom="""
+        bbox = request.query_params.get("bbox")
+        zoom = request.query_params.get("zoom")
+        if not bbox or not zoom:
+            raise ValidationError({"detail": "Parameters 'bbox' and 'zoom' are required."})
+
+        queryset = self.filter_queryset(get_geo_queryset(model))
+        filter_params = "&".join(
+            f"{key}={value}" for key, value in sorted(request.query_params.items())
+            if key not in ("bbox", "zoom")
+        )
+        return Response(
+            get_clusters(model, queryset, parse_bbox(bbox), parse_zoom(zoom), filter_params)
+        )
 
     # Build the ViewSet class dynamically with type()
-    return type(
+    viewset_class = type(
         viewset_name,
-        (viewsets.ReadOnlyModelViewSet,),
+        (DeltaSyncMixin, ConditionalGetMixin, viewsets.ReadOnlyModelViewSet),
         {
             "queryset": queryset,
             "serializer_class": serializer_class,
             "ordering_fields": ["id"],
             "pagination_class": None,
-            "filter_backends": [DjangoFilterBackend, OrderingFilter, SearchFilter],
-            "filterset_class": dynamic_filter_class,
+            "renderer_classes": [*api_settings.DEFAULT_RENDERER_CLASSES,
+                                 FlatGeobufRenderer, GeoParquetRenderer, TopoJSONRenderer],
+            "filter_backends": [DjangoFilterBackend, BoundingBoxFilterBackend, OrderingFilter,
+                                SearchFilter, SparseFieldsFilterBackend],
+            # Built lazily on the first request, cached per config version
+            "filterset_class": property(lambda self: get_dynamic_geo_filter(model)),
             "list": merged_list,  # Overriding list method
+            "render_layer": render_layer,
+            "render_changes": render_changes,
+            "export_layer": export_layer,
+            "render_layer_topology": render_layer_topology,
+            "get_renderers": get_renderers,
+            "clusters": clusters,
         },
-    )
\ No newline at end of file
+    )
+    GEO_VIEWSETS[model.__name__.lower()] = viewset_class
+    return viewset_class
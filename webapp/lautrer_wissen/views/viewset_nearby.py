@@ -0,0 +1,84 @@
+# Copyright (c) 2025 Vision Impulse GmbH
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# Authors: Benjamin Bischke
+
+from django.contrib.gis.geos import Point
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from ..geo_sql import API_SRID
+from ..models import API_GEO_MODELS
+from ..nearby import has_indexed_geometry, nearby_objects
+
+MAX_NEARBY_LAYERS = 50
+MAX_NEARBY_LIMIT = 100
+
+# Layers located by latitude/longitude columns have no geometry index to search
+NEARBY_MODELS = {
+    model.__name__.lower(): model for model in API_GEO_MODELS if has_indexed_geometry(model)
+}
+
+
+class NearbyView(APIView):
+    """
+    Handles GET /api/nearby/?lat=49.44&lon=7.77&layers=wikifountain,wikibrewery&limit=10
+
+    Returns the objects of the given layers closest to the location, ordered
+    by their distance in metres. All layers are queried in one UNION query,
+    each of them searched on its geometry index, see `nearby_objects`.
+    Layers without a geometry column are not available.
+    """
+
+    def get(self, request):
+        origin = self.get_origin(request)
+        models = self.get_models(request)
+        limit = self.get_limit(request)
+
+        objects = nearby_objects(origin, [model.objects.all() for model in models], limit)
+        return Response({"objects": objects})
+
+    def get_origin(self, request):
+        try:
+            lat = float(request.query_params["lat"])
+            lon = float(request.query_params["lon"])
+        except (KeyError, ValueError):
+            raise ValidationError({"detail": "Expected the location as 'lat' and 'lon'."})
+        if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+            raise ValidationError({"detail": "Location out of range."})
+        return Point(lon, lat, srid=API_SRID)
+
+    def get_models(self, request):
+        layers = request.query_params.get("layers", "")
+        layer_names = list(dict.fromkeys(name.strip().lower() for name in layers.split(",") if name.strip()))
+        if not layer_names:
+            raise ValidationError({"layers": "Expected a comma separated list of layers."})
+        if len(layer_names) > MAX_NEARBY_LAYERS:
+            raise ValidationError({"layers": f"At most {MAX_NEARBY_LAYERS} layers per request."})
+
+        unknown = [name for name in layer_names if name not in NEARBY_MODELS]
+        if unknown:
+            raise ValidationError({"layers": f"Unknown layers: {', '.join(unknown)}"})
+        return [NEARBY_MODELS[name] for name in layer_names]
+
+    def get_limit(self, request):
+        try:
+            limit = int(request.query_params.get("limit", 10))
+        except ValueError:
+            raise ValidationError({"limit": "Expected an integer."})
+        if not 1 <= limit <= MAX_NEARBY_LIMIT:
+            raise ValidationError({"limit": f"Limit must be between 1 and {MAX_NEARBY_LIMIT}."})
+        return limit
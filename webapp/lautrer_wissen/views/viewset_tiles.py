@@ -0,0 +1,121 @@
+# Copyright (c) 2025 Vision Impulse GmbH
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# Authors: Benjamin Bischke
+
+from django.db import connection
+from django.http import Http404, HttpResponse
+from django.views.decorators.http import require_GET
+
+from frontend_config.utils import get_model_field_mapping
+from ..geo_sql import (
+    geometry_expression, id_expression, overlaps_expression, property_columns, quote_alias,
+    supports_sql_rendering,
+)
+from ..models import API_GEO_MODELS
+
+MVT_CONTENT_TYPE = "application/vnd.mapbox-vector-tile"
+MVT_EXTENT = 4096
+MVT_BUFFER = 64
+MAX_ZOOM = 22
+TILE_CACHE_MAX_AGE = 300
+
+# ST_AsMVT only accepts integer feature ids
+MVT_FEATURE_ID_TYPES = {
+    "AutoField", "BigAutoField", "SmallAutoField", "IntegerField", "BigIntegerField",
+}
+
+
+def get_tile_model(model_name):
+    """
+    Return the geo model served as `model_name` tiles. Models formatted in
+    Python (wiki objects, frontend links, merged features) are not served,
+    tiles are built in SQL and would differ from the GeoJSON endpoint.
+    """
+    for model in API_GEO_MODELS:
+        if model.__name__.lower() == model_name.lower():
+            return model if supports_sql_rendering(model) else None
+    return None
+
+
+def build_tile_query(model, lod_field=None):
+    """
+    SQL returning the vector tile of `model` for the parameters (z, x, y).
+    Features carry the same properties as the GeoJSON endpoint.
+    """
+    geometry = geometry_expression(model, lod_field=lod_field)
+    if geometry is None:
+        return None
+
+    _, visible_object_name = get_model_field_mapping(model)
+    pk = model._meta.pk
+    # The public id (e.g. virtual_id) is a property, the feature id is the integer pk
+    feature_id_name = "NULL::text"
+    columns = [f"{id_expression(model)} AS id"]
+    if pk.get_internal_type() in MVT_FEATURE_ID_TYPES:
+        feature_id_name = "'mvt_feature_id'"
+        columns.append(f"t.{connection.ops.quote_name(pk.column)} AS mvt_feature_id")
+    columns += [
+        f"%s::text AS {quote_alias('Objektart')}",
+    ]
+    columns.extend(
+        f"{expression} AS {quote_alias(name)}"
+        for expression, name in property_columns(model)
+        if name != "Objektart"
+    )
+
+    sql = f"""
+        WITH bounds AS (
+            SELECT ST_TileEnvelope(%s, %s, %s) AS geom
+        ),
+        mvtgeom AS (
+            SELECT
+                ST_AsMVTGeom(
+                    ST_Transform({geometry}, 3857), bounds.geom, {MVT_EXTENT}, {MVT_BUFFER}, true
+                ) AS mvt_geometry,
+                {", ".join(columns)}
+            FROM {connection.ops.quote_name(model._meta.db_table)} AS t, bounds
+            WHERE {overlaps_expression(model, "ST_Transform(bounds.geom, 4326)")}
+        )
+        SELECT ST_AsMVT(mvtgeom.*, %s, {MVT_EXTENT}, 'mvt_geometry', {feature_id_name})
+        FROM mvtgeom
+        WHERE mvt_geometry IS NOT NULL
+    """
+    return sql, visible_object_name
+
+
+@require_GET
+def geo_tile_view(request, model_name, z, x, y):
+    """Serve a Mapbox vector tile (MVT) for the given geo model."""
+    model = get_tile_model(model_name)
+    if model is None:
+        raise Http404(f"Unknown layer '{model_name}' or not available as vector tiles")
+    if z > MAX_ZOOM or x >= 2 ** z or y >= 2 ** z:
+        raise Http404("Tile out of range")
+
+    lod_field = model.get_lod_field(zoom=z) if hasattr(model, "get_lod_field") else None
+    query = build_tile_query(model, lod_field)
+    if query is None:
+        raise Http404(f"Layer '{model_name}' has no geometry")
+    sql, visible_object_name = query
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [z, x, y, visible_object_name, model.__name__.lower()])
+        row = cursor.fetchone()
+
+    tile = bytes(row[0]) if row and row[0] is not None else b""
+    response = HttpResponse(tile, content_type=MVT_CONTENT_TYPE)
+    response["Cache-Control"] = f"public, max-age={TILE_CACHE_MAX_AGE}"
+    return response
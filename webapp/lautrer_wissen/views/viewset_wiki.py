@@ -15,6 +15,7 @@
 #
 # Authors: Benjamin Bischke
 
+from django.db.models import F
 from django.shortcuts import get_object_or_404
 from rest_framework.response import Response
 from rest_framework.viewsets import ReadOnlyModelViewSet
@@ -22,21 +23,31 @@ from django.http import Http404
 
 
 from ..serializers.wiki_serializer import get_wiki_serializer_for_model
+from .mixins import ConditionalGetMixin
 
 
 def create_wiki_viewset(model):
     """Dynamically create a ViewSet for list and detail views."""
 
-    class GenericWikiViewSet(ReadOnlyModelViewSet):
+    class GenericWikiViewSet(ConditionalGetMixin, ReadOnlyModelViewSet):
         """API ViewSet for listing all objects and retrieving details."""
 
+        def get_conditional_queryset(self):
+            return model.objects.all()
+
         def get_object(self):
             """Override default get_object to use virtual_id instead of pk."""
             pk = self.kwargs.get(self.lookup_field)
-            for obj in model.objects.all():
-                if obj.virtual_id == pk:
-                    return obj
-            raise Http404(f"{model.__name__} with virtual_id '{pk}' not found")
+            # Objects sharing a location share the id (their detail page is
+            # the same), during an import it exists in the old and new rows
+            obj = (
+                model.objects.filter(virtual_id=pk)
+                .order_by(F("insert_timestamp").desc(nulls_last=True), "pk")
+                .first()
+            )
+            if obj is None:
+                raise Http404(f"{model.__name__} with virtual_id '{pk}' not found")
+            return obj
 
         def list(self, request):
             """Handles GET /api/{model_name}/"""
@@ -44,18 +55,14 @@ def create_wiki_viewset(model):
 
             objects = [
                 {
-                    "coordinate": (obj.geometry.y, obj.geometry.x),
-                    "image_url": obj.image_url,
-                    "image_license_url": obj.image_license_url,
-                    "image_license_text": obj.image_license_text,
-                    "image_author_name": obj.image_author_name,
-                    "city_district_name": (
-                        "Kaiserslautern Umkreis"
-                        if obj.city_district_name == ""
-                        else obj.city_district_name
-                    ),
-                    "name": obj.combined_name,
-                    "id": obj.virtual_id,
+                    "coordinate": (obj["geometry"].y, obj["geometry"].x),
+                    "image_url": obj["image_url"],
+                    "image_license_url": obj["image_license_url"],
+                    "image_license_text": obj["image_license_text"],
+                    "image_author_name": obj["image_author_name"],
+                    "city_district_name": obj["display_subtitle"],
+                    "name": obj["display_name"],
+                    "id": obj["virtual_id"],
                 }
                 for obj in objects
             ]
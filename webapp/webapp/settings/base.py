@@ -79,6 +79,53 @@ EMAIL_USE_TLS = env.bool("DJANGO_EMAIL_USE_TLS", default=True)
 REDIS_HOST = env('REDIS_HOST', default="redis")
 REDIS_PORT = env.int("REDIS_PORT", default=6379)
 REDIS_URL = f"redis://{REDIS_HOST}:{REDIS_PORT}/0"
+REDIS_CACHE_URL = f"redis://{REDIS_HOST}:{REDIS_PORT}/1"
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    # Point clusters (/api/geo/<model>/clusters/), shared between worker processes
+    "geo_clusters": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": env("DJANGO_GEO_CLUSTER_CACHE_URL", default=REDIS_CACHE_URL),
+    },
+}
+
+# Share invalidations of the cached frontend model config between worker processes via Redis
+MODEL_CONFIG_CACHE_SHARED = env.bool("DJANGO_MODEL_CONFIG_CACHE_SHARED", default=True)
+
+# GeoJSON snapshot settings (pre-rendered, unfiltered /api/geo/<model> responses)
+GEO_SNAPSHOTS_ENABLED = env.bool("DJANGO_GEO_SNAPSHOTS_ENABLED", default=True)
+GEO_SNAPSHOT_DIR = env(
+    "DJANGO_GEO_SNAPSHOT_DIR",
+    default=os.path.join(env("APP_DATA_DIR", default="./data/"), "geo_snapshots"),
+)
+
+# Build GeoJSON of layers without Python side formatting directly in PostgreSQL
+GEO_SQL_RENDERING_ENABLED = env.bool("DJANGO_GEO_SQL_RENDERING_ENABLED", default=True)
+
+# Default number of decimal digits of GeoJSON coordinates (6 digits are about 10 cm),
+# overridable per model (COORDINATE_PRECISION) and per request (?precision=)
+GEO_COORDINATE_PRECISION = env.int("DJANGO_GEO_COORDINATE_PRECISION", default=6)
+
+# Seconds point clusters (/api/geo/<model>/clusters/) are cached per tile
+GEO_CLUSTER_CACHE_TIMEOUT = env.int("DJANGO_GEO_CLUSTER_CACHE_TIMEOUT", default=24 * 3600)
+
+# Number of threads rendering the layers of one /api/geo/batch/ request
+GEO_BATCH_MAX_WORKERS = env.int("DJANGO_GEO_BATCH_MAX_WORKERS", default=4)
+
+# Number of rows fetched per database round trip for streamed GeoJSON responses (?stream=true)
+GEO_STREAM_CHUNK_SIZE = env.int("DJANGO_GEO_STREAM_CHUNK_SIZE", default=2000)
+
+# Grid steps per axis TopoJSON coordinates (?format=topojson) are quantized to
+GEO_TOPOJSON_QUANTIZATION = env.int("DJANGO_GEO_TOPOJSON_QUANTIZATION", default=100000)
+
+# Number of nearest objects precomputed per object with a detail page
+GEO_NEARBY_OBJECTS_COUNT = env.int("DJANGO_GEO_NEARBY_OBJECTS_COUNT", default=5)
+
+# Number of import runs per model whose feature changes are kept for delta sync (?since=)
+GEO_CHANGELOG_RETENTION_RUNS = env.int("DJANGO_GEO_CHANGELOG_RETENTION_RUNS", default=100)
 
 # Log settings
 LOG_DIR = env("APP_LOG_DIR", default="/logs") # BB: For Docker,  use '.local' if django is started without docker
@@ -130,6 +177,7 @@ INSTALLED_APPS = [
     'django.contrib.messages',
     'django.contrib.staticfiles',
     'django.contrib.gis',
+    'django.contrib.postgres',
 ]
 
 MIDDLEWARE = [
@@ -51,6 +51,7 @@ urlpatterns = [
     path("admin/monitoring/", include("monitoring.urls")), 
     path('admin/pipeline_manager/', include('pipeline_manager.urls')),  
     path('api/', include(router.urls)),
+    path('api/', include('lautrer_wissen.urls')),
 ]
 
 if settings.DEBUG: